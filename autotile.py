@@ -0,0 +1,106 @@
+"""
+Clasificacion de autotiles compartida por Level, LevelEditor y level_compiler.
+
+Cada celda solida se describe con una mascara de 4 bits (vecino arriba, abajo,
+izquierda, derecha) y el tipo sale de una tabla de 16 entradas. Cualquier tile
+cuenta como vecino, no solo '#'.
+"""
+
+import numpy as np
+
+TOP, BOTTOM, LEFT, RIGHT = 1, 2, 4, 8
+
+AUTOTILE_TYPES = [
+    'center', 'top', 'bottom', 'left', 'right',
+    'top_left', 'top_right', 'bottom_left', 'bottom_right',
+]
+
+
+def _type_for_mask(mask):
+    has_top = mask & TOP
+    has_bottom = mask & BOTTOM
+    has_left = mask & LEFT
+    has_right = mask & RIGHT
+
+    if not has_top and not has_left:
+        return 'top_left'
+    elif not has_top and not has_right:
+        return 'top_right'
+    elif not has_bottom and not has_left:
+        return 'bottom_left'
+    elif not has_bottom and not has_right:
+        return 'bottom_right'
+    elif not has_top:
+        return 'top'
+    elif not has_bottom:
+        return 'bottom'
+    elif not has_left:
+        return 'left'
+    elif not has_right:
+        return 'right'
+    return 'center'
+
+
+TYPE_LUT = np.array([AUTOTILE_TYPES.index(_type_for_mask(mask)) for mask in range(16)], dtype=np.uint8)
+_TYPE_LIST = TYPE_LUT.tolist()
+
+
+def neighbour_masks(solid):
+    """Mascara de vecinos de cada celda de una rejilla booleana (fuera de ella = vacio)"""
+    padded = np.pad(solid.astype(bool), 1)
+    masks = padded[:-2, 1:-1] * np.uint8(TOP)
+    masks |= padded[2:, 1:-1] * np.uint8(BOTTOM)
+    masks |= padded[1:-1, :-2] * np.uint8(LEFT)
+    masks |= padded[1:-1, 2:] * np.uint8(RIGHT)
+    return masks
+
+
+def classify_grid(solid):
+    """Indice en AUTOTILE_TYPES de cada celda (las vacias quedan como 'center')"""
+    return TYPE_LUT[neighbour_masks(solid)]
+
+
+def classify_cells(cells):
+    """
+    Clasifica un conjunto disperso de celdas (col, row) de una vez.
+    Devuelve un dict (col, row) -> indice en AUTOTILE_TYPES.
+    """
+    if not cells:
+        return {}
+
+    positions = np.array(list(cells), dtype=np.int64)
+    min_col, min_row = positions.min(axis=0)
+    cols = positions[:, 0] - min_col
+    rows = positions[:, 1] - min_row
+
+    solid = np.zeros((rows.max() + 1, cols.max() + 1), dtype=bool)
+    solid[rows, cols] = True
+    types = classify_grid(solid)[rows, cols]
+
+    return dict(zip(map(tuple, positions.tolist()), types.tolist()))
+
+
+def cell_type(is_solid, col, row):
+    """Tipo de una sola celda; is_solid recibe (col, row)"""
+    mask = 0
+    if is_solid((col, row - 1)):
+        mask |= TOP
+    if is_solid((col, row + 1)):
+        mask |= BOTTOM
+    if is_solid((col - 1, row)):
+        mask |= LEFT
+    if is_solid((col + 1, row)):
+        mask |= RIGHT
+    return _TYPE_LIST[mask]
+
+
+def update_around(types, is_solid, col, row):
+    """
+    Modo incremental: tras editar (col, row) reclasifica solo esa celda y sus 4 vecinos.
+    types es el dict devuelto por classify_cells.
+    """
+    for cell in ((col, row), (col, row - 1), (col, row + 1), (col - 1, row), (col + 1, row)):
+        if is_solid(cell):
+            types[cell] = cell_type(is_solid, *cell)
+        else:
+            types.pop(cell, None)
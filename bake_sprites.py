@@ -0,0 +1,77 @@
+"""
+Pre-compone las capas del Mage (BODY, LEGS, TORSO, HEAD, BELT) en un atlas por color.
+Mage.load_sprites usa el atlas si existe y sus capas no cambiaron (mtime/tamano/sha256
+guardados en el manifest); si no, compone en vivo.
+
+Uso: python bake_sprites.py
+"""
+
+import os
+import json
+
+os.environ.setdefault("GAME_HEADLESS", "1")
+
+import pygame
+from mage import (LAYERS, ANIMATION_FOLDERS, BAKED_DIR, BAKED_MANIFEST, COLOR_VARIANTS, Mage,
+                  layer_sources, source_stamp)
+
+FRAME_SIZE = 64
+
+
+def bake_variant(color, base_path):
+    animations = Mage.composite_animations(base_path)
+
+    atlas_width = max(sheet.get_width() for sheet in animations.values())
+    atlas_height = sum(sheet.get_height() for sheet in animations.values())
+    atlas = pygame.Surface((atlas_width, atlas_height), pygame.SRCALPHA)
+
+    entries = {}
+    y = 0
+    for name, sheet in animations.items():
+        atlas.blit(sheet, (0, y))
+        entries[name] = {
+            "x": 0,
+            "y": y,
+            "width": sheet.get_width(),
+            "height": sheet.get_height(),
+            "frame_count": sheet.get_width() // FRAME_SIZE,
+            "direction_rows": sheet.get_height() // FRAME_SIZE,
+        }
+        y += sheet.get_height()
+
+    atlas_file = f"{color}.png"
+    pygame.image.save(atlas, f"{BAKED_DIR}/{atlas_file}")
+
+    return {
+        "source": base_path,
+        "sources": {path: source_stamp(path) for path in layer_sources(base_path)},
+        "atlas": atlas_file,
+        "animations": entries,
+    }
+
+
+def main():
+    os.makedirs(BAKED_DIR, exist_ok=True)
+
+    manifest = {
+        "frame_size": FRAME_SIZE,
+        "layers": LAYERS,
+        "folders": ANIMATION_FOLDERS,
+        "variants": {},
+    }
+
+    for color, base_path in COLOR_VARIANTS.items():
+        if not os.path.exists(base_path):
+            print(f"⚠️  {base_path} no existe, se omite")
+            continue
+        manifest["variants"][color] = bake_variant(color, base_path)
+        print(f"✓ {color}: {BAKED_DIR}/{manifest['variants'][color]['atlas']}")
+
+    with open(BAKED_MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=4)
+
+    print(f"✅ Manifest guardado en {BAKED_MANIFEST}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+import os
+import sys
+import json
+import glob
+import math
+import time
+import random
+import argparse
+import platform
+import tempfile
+
+os.environ.setdefault("GAME_HEADLESS", "1")
+
+import pygame
+from config import TILE_SIZE
+from level import Level
+from projectile import Fireball
+from headless import ScriptedInput, create_game
+
+IDLE_SCRIPT = "idle:1"
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    n = len(ordered)
+    if n == 0:
+        return {"n": 0}
+
+    def percentile(p):
+        return ordered[max(0, math.ceil(p * n) - 1)] * 1000.0
+
+    return {
+        "n": n,
+        "min_ms": ordered[0] * 1000.0,
+        "median_ms": percentile(0.5),
+        "p99_ms": percentile(0.99),
+        "mean_ms": sum(ordered) / n * 1000.0,
+    }
+
+
+def list_levels():
+    levels = sorted(glob.glob("levels/*.txt"))
+    if os.path.exists("level_order.json"):
+        with open("level_order.json", "r") as f:
+            for level_file in json.load(f):
+                if level_file not in levels and os.path.exists(level_file):
+                    levels.append(level_file)
+    return levels
+
+
+def time_construction(level_file, repeats):
+    samples = []
+    for _ in range(repeats):
+        random.seed(0)
+        start = time.perf_counter()
+        Level(level_file)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def time_game(game, ticks, warmup, before_tick=None):
+    """Mide Game.update y Game.draw por separado, ignorando ticks con cambio de estado."""
+    for _ in range(warmup):
+        if before_tick:
+            before_tick(game)
+        game.simulate_tick()
+
+    update_samples = []
+    draw_samples = []
+    for _ in range(ticks):
+        if game.game_state != "playing":
+            game.simulate_tick()
+            continue
+
+        if before_tick:
+            before_tick(game)
+
+        level = game.level
+        start = time.perf_counter()
+        game.update()
+        elapsed = time.perf_counter() - start
+        if game.game_state == "playing" and game.level is level:
+            update_samples.append(elapsed)
+
+            start = time.perf_counter()
+            game.draw()
+            draw_samples.append(time.perf_counter() - start)
+
+    return summarize(update_samples), summarize(draw_samples)
+
+
+def new_game(level_file):
+    random.seed(0)
+    return create_game(level_file, ScriptedInput.from_string(IDLE_SCRIPT))
+
+
+def bench_levels(results, args):
+    for level_file in list_levels():
+        results[f"construct/{level_file}"] = time_construction(level_file, args.repeats)
+
+        game = new_game(level_file)
+        update_stats, draw_stats = time_game(game, args.ticks, args.warmup)
+        results[f"update/{level_file}"] = update_stats
+        results[f"draw/{level_file}"] = draw_stats
+        print(f"{level_file}: construct {results[f'construct/{level_file}']['median_ms']:.2f}ms, "
+              f"update {update_stats.get('median_ms', 0):.3f}ms, draw {draw_stats.get('median_ms', 0):.3f}ms")
+
+
+def sweep_monsters(results, args, counts=None, key="monsters"):
+    monster_types = ["flying_eye", "goblin", "skeleton", "goblin"]
+
+    for count in counts or args.monster_counts:
+        game = new_game(args.sweep_level)
+        width, _ = game.level.get_dimensions()
+        rng = random.Random(count)
+        for _ in range(count):
+            x = rng.randrange(0, max(1, width - 80))
+            game.level.add_monster(x, 0, rng.choice(monster_types))
+
+        update_stats, draw_stats = time_game(game, args.ticks, args.warmup)
+        results[f"sweep/{key}/{count}/update"] = update_stats
+        results[f"sweep/{key}/{count}/draw"] = draw_stats
+        print(f"{key}={count}: update {update_stats.get('median_ms', 0):.3f}ms, "
+              f"draw {draw_stats.get('median_ms', 0):.3f}ms")
+
+
+def sweep_horde(results, args):
+    # Mismo barrido, con los monstruos en MonsterSystem (arreglos NumPy)
+    previous = Level.use_monster_system
+    Level.use_monster_system = True
+    try:
+        sweep_monsters(results, args, args.horde_counts, "horde")
+    finally:
+        Level.use_monster_system = previous
+
+
+def sweep_projectiles(results, args):
+    for count in args.projectile_counts:
+        game = new_game(args.sweep_level)
+        rng = random.Random(count)
+
+        def top_up(game):
+            while len(game.projectiles) < count:
+                game.projectiles.append(Fireball.spawn(game.player.rect.centerx + rng.randrange(-300, 300),
+                                                 game.player.rect.centery + rng.randrange(-200, 0),
+                                                 rng.choice([0, 1, 2, 3])))
+
+        update_stats, draw_stats = time_game(game, args.ticks, args.warmup, top_up)
+        results[f"sweep/projectiles/{count}/update"] = update_stats
+        results[f"sweep/projectiles/{count}/draw"] = draw_stats
+        print(f"projectiles={count}: update {update_stats.get('median_ms', 0):.3f}ms, "
+              f"draw {draw_stats.get('median_ms', 0):.3f}ms")
+
+
+def build_wide_level(source_file, copies, target_dir):
+    with open(source_file, "r") as f:
+        lines = [line.rstrip("\n") for line in f.readlines()]
+
+    width = max(len(line) for line in lines)
+    wide_lines = []
+    for line in lines:
+        padded = line.ljust(width)
+        extra = "".join(padded for _ in range(copies - 1))
+        for char in "PGBU":
+            extra = extra.replace(char, " ")
+        wide_lines.append(padded + extra)
+
+    path = os.path.join(target_dir, f"wide_x{copies}.txt")
+    with open(path, "w") as f:
+        f.write("\n".join(line.rstrip() for line in wide_lines) + "\n")
+    return path
+
+
+def sweep_level_size(results, args, key="level_size"):
+    with tempfile.TemporaryDirectory() as target_dir:
+        for copies in args.size_copies:
+            level_file = build_wide_level(args.sweep_level, copies, target_dir)
+            construct_stats = time_construction(level_file, args.repeats)
+
+            game = new_game(level_file)
+            update_stats, draw_stats = time_game(game, args.ticks, args.warmup)
+            # Con streaming platform_grid solo tiene los tiles de los chunks activos
+            tiles = len(game.level.platform_grid)
+            results[f"sweep/{key}/x{copies}/construct"] = construct_stats
+            results[f"sweep/{key}/x{copies}/update"] = update_stats
+            results[f"sweep/{key}/x{copies}/draw"] = draw_stats
+            print(f"{key} x{copies} ({tiles} tiles activos): construct {construct_stats['median_ms']:.2f}ms, "
+                  f"update {update_stats.get('median_ms', 0):.3f}ms, draw {draw_stats.get('median_ms', 0):.3f}ms")
+
+
+def sweep_stream(results, args):
+    # Mismo barrido de tamano, activando solo los chunks cercanos a la camara
+    previous = Level.streaming
+    Level.streaming = True
+    try:
+        sweep_level_size(results, args, "stream")
+    finally:
+        Level.streaming = previous
+
+
+def compare(results, baseline_file):
+    with open(baseline_file, "r") as f:
+        baseline = json.load(f).get("results", {})
+
+    print()
+    print(f"{'benchmark':50} {'antes':>10} {'ahora':>10} {'cambio':>8}")
+    for key, stats in results.items():
+        old = baseline.get(key)
+        if not old or "median_ms" not in old or "median_ms" not in stats:
+            continue
+        before = old["median_ms"]
+        after = stats["median_ms"]
+        change = (after - before) / before * 100.0 if before > 0 else 0.0
+        print(f"{key:50} {before:10.3f} {after:10.3f} {change:+7.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de carga, simulacion y render de niveles")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="JSON de una corrida anterior para comparar medianas")
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--sweep-level", default="levels/level4.txt")
+    parser.add_argument("--monster-counts", type=int, nargs="*", default=[0, 25, 100, 400])
+    parser.add_argument("--horde-counts", type=int, nargs="*", default=[25, 400, 2000, 5000])
+    parser.add_argument("--projectile-counts", type=int, nargs="*", default=[0, 10, 50, 200])
+    parser.add_argument("--size-copies", type=int, nargs="*", default=[1, 2, 4, 8])
+    parser.add_argument("--only", choices=["levels", "monsters", "horde", "projectiles", "size", "stream"], nargs="*")
+    args = parser.parse_args(argv)
+
+    suites = {
+        "levels": bench_levels,
+        "monsters": sweep_monsters,
+        "horde": sweep_horde,
+        "projectiles": sweep_projectiles,
+        "size": sweep_level_size,
+        "stream": sweep_stream,
+    }
+
+    results = {}
+    for name, suite in suites.items():
+        if not args.only or name in args.only:
+            suite(results, args)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "tile_size": TILE_SIZE,
+            "ticks": args.ticks,
+            "warmup": args.warmup,
+            "repeats": args.repeats,
+            "sweep_level": args.sweep_level,
+        },
+        "results": results,
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"\nResultados guardados en {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,7 +1,14 @@
 # boss.py - COMPLETO CON MOVIMIENTO, PATRÓN Y CÁMARA
+import math
 import pygame
+from projectile import ProjectilePool, recycle_dead
+from spatial_hash import SpatialHash
+from text_cache import get_font, render_text
 
 class Boss(pygame.sprite.Sprite):
+    # Tiras escaladas (y volteadas) compartidas por boss_type
+    _strips = {}
+    
     def __init__(self, x, y, boss_type="andromalius"):
         super().__init__()
         
@@ -12,6 +19,7 @@ class Boss(pygame.sprite.Sprite):
         self.spawn_x = x
         self.spawn_y = y
         self.rect = pygame.Rect(x, y, self.display_width, self.display_height)
+        self.prev_pos = self.rect.topleft
         
         # MOVIMIENTO
         self.move_speed = 2
@@ -32,7 +40,9 @@ class Boss(pygame.sprite.Sprite):
         self.telegraph_timer = 0
         
         self.projectiles = []
+        self.projectile_hash = SpatialHash()
         self.projectile_type = self.get_projectile_type()
+        BossProjectile.load_sheet(self.projectile_type)
         
         self.safe_zone_height = 128
         
@@ -58,21 +68,60 @@ class Boss(pygame.sprite.Sprite):
         return projectile_map.get(self.boss_type, "flameball")
     
     def load_sprite(self):
+        strip = Boss._strips.get(self.boss_type)
+        if strip is None:
+            strip = self.build_strip()
+            Boss._strips[self.boss_type] = strip
+        
+        for name, value in strip.items():
+            setattr(self, name, value)
+        
+        self.flash_surf = pygame.Surface((self.display_width + 20, self.display_height + 20))
+        self.flash_surf.fill((255, 100, 100))
+    
+    def build_strip(self):
+        """Carga la hoja una vez y pre-escala todos los frames, mirando a la derecha y a la izquierda."""
         try:
-            self.sprite_sheet = pygame.image.load(self.sprite_path)
-            self.frame_width, self.frame_height = self.get_frame_dimensions()
-            self.num_frames = self.sprite_sheet.get_width() // self.frame_width
-            self.scale_factor = 5.0
-            self.display_width = int(self.frame_width * self.scale_factor)
-            self.display_height = int(self.frame_height * self.scale_factor)
+            sprite_sheet = pygame.image.load(self.sprite_path)
+            if pygame.display.get_surface():
+                sprite_sheet = sprite_sheet.convert_alpha()
+            frame_width, frame_height = self.get_frame_dimensions()
+            num_frames = sprite_sheet.get_width() // frame_width
+            scale_factor = 5.0
+            display_width = int(frame_width * scale_factor)
+            display_height = int(frame_height * scale_factor)
+            
+            frames_right = []
+            frames_left = []
+            for i in range(num_frames):
+                frame = sprite_sheet.subsurface(
+                    pygame.Rect(i * frame_width, 0, frame_width, frame_height)
+                )
+                scaled = pygame.transform.scale(frame, (display_width, display_height))
+                frames_right.append(scaled)
+                frames_left.append(pygame.transform.flip(scaled, True, False))
+            
+            return {
+                "sprite_sheet": sprite_sheet,
+                "frame_width": frame_width,
+                "frame_height": frame_height,
+                "num_frames": num_frames,
+                "scale_factor": scale_factor,
+                "display_width": display_width,
+                "display_height": display_height,
+                "frames_right": frames_right,
+                "frames_left": frames_left,
+            }
         except Exception:
             # Fallback en silencio
-            self.sprite_sheet = None
-            self.frame_width = 64
-            self.frame_height = 128
-            self.num_frames = 1
-            self.display_width = 64
-            self.display_height = 128
+            return {
+                "sprite_sheet": None,
+                "frame_width": 64,
+                "frame_height": 128,
+                "num_frames": 1,
+                "display_width": 64,
+                "display_height": 128,
+            }
     
     def get_frame_dimensions(self):
         dimensions = {
@@ -89,6 +138,8 @@ class Boss(pygame.sprite.Sprite):
         return dimensions.get(self.boss_type, (64, 64))
     
     def update(self):
+        self.prev_pos = self.rect.topleft
+        
         # MOVIMIENTO
         if self.is_moving:
             self.move_timer += 1
@@ -119,10 +170,13 @@ class Boss(pygame.sprite.Sprite):
             self.animation_counter = 0
         
         # PROYECTILES
-        for proj in self.projectiles[:]:
+        for proj in self.projectiles:
             proj.update()
-            if not proj.alive:
-                self.projectiles.remove(proj)
+        recycle_dead(self.projectiles)
+        
+        self.projectile_hash.clear()
+        for proj in self.projectiles:
+            self.projectile_hash.insert(proj.rect, proj)
     
     def execute_attack_pattern(self, pattern):
         count = pattern['count']
@@ -137,7 +191,7 @@ class Boss(pygame.sprite.Sprite):
             proj_x = self.rect.centerx
             proj_y = self.rect.centery
             
-            projectile = BossProjectile(
+            projectile = BossProjectile.pool.acquire(
                 proj_x, proj_y,
                 direction=-1,
                 projectile_type=self.projectile_type,
@@ -152,39 +206,25 @@ class Boss(pygame.sprite.Sprite):
         return False
     
     def check_hit_player(self, player):
-        for proj in self.projectiles:
-            if player.rect.colliderect(proj.rect):
-                proj.alive = False
-                return True
+        for proj in self.projectile_hash.query(player.rect):
+            proj.alive = False
+            return True
         return False
     
     def get_current_frame(self):
         if not self.sprite_sheet:
             return None
         
-        frame_x = self.current_frame * self.frame_width
-        frame = self.sprite_sheet.subsurface(
-            pygame.Rect(frame_x, 0, self.frame_width, self.frame_height)
-        )
-        
-        scaled_frame = pygame.transform.scale(
-            frame,
-            (self.display_width, self.display_height)
-        )
-        
         if self.facing_left:
-            scaled_frame = pygame.transform.flip(scaled_frame, True, False)
-        
-        return scaled_frame
+            return self.frames_left[self.current_frame]
+        return self.frames_right[self.current_frame]
     
     def draw(self, surface):
         """Dibuja sin cámara"""
         if self.telegraph_timer > 0:
             intensity = int(255 * (self.telegraph_timer / 30))
-            flash_surf = pygame.Surface((self.display_width + 20, self.display_height + 20))
-            flash_surf.set_alpha(intensity // 2)
-            flash_surf.fill((255, 100, 100))
-            surface.blit(flash_surf, (self.rect.x - 10, self.rect.y - 10))
+            self.flash_surf.set_alpha(intensity // 2)
+            surface.blit(self.flash_surf, (self.rect.x - 10, self.rect.y - 10))
         
         frame = self.get_current_frame()
         if frame:
@@ -203,20 +243,19 @@ class Boss(pygame.sprite.Sprite):
         )
         pygame.draw.rect(surface, (0, 255, 0), safe_zone, 2)
         
-        font = pygame.font.Font(None, 20)
-        text = font.render("SAFE ZONE", True, (0, 255, 0))
+        font = get_font(20)
+        text = render_text(font, "SAFE ZONE", (0, 255, 0))
         surface.blit(text, (safe_zone.x + 70, safe_zone.centery))
     
     def draw_with_camera(self, surface, camera):
         """Dibuja con cámara"""
-        boss_screen_rect = camera.apply(self.rect)
+        boss_rect = camera.lerp(self.rect, self.prev_pos)
+        boss_screen_rect = camera.apply(boss_rect)
         
         if self.telegraph_timer > 0:
             intensity = int(255 * (self.telegraph_timer / 30))
-            flash_surf = pygame.Surface((self.display_width + 20, self.display_height + 20))
-            flash_surf.set_alpha(intensity // 2)
-            flash_surf.fill((255, 100, 100))
-            surface.blit(flash_surf, (boss_screen_rect.x - 10, boss_screen_rect.y - 10))
+            self.flash_surf.set_alpha(intensity // 2)
+            surface.blit(self.flash_surf, (boss_screen_rect.x - 10, boss_screen_rect.y - 10))
         
         frame = self.get_current_frame()
         if frame:
@@ -225,7 +264,9 @@ class Boss(pygame.sprite.Sprite):
             pygame.draw.rect(surface, (200, 50, 50), boss_screen_rect)
         
         for proj in self.projectiles:
-            proj_screen_rect = camera.apply(proj.rect)
+            if not camera.is_visible(proj.rect):
+                continue
+            proj_screen_rect = camera.apply(camera.lerp(proj.rect, proj.prev_pos))
             proj_frame = proj.get_current_frame()
             if proj_frame:
                 surface.blit(proj_frame, (proj_screen_rect.x, proj_screen_rect.y))
@@ -233,21 +274,33 @@ class Boss(pygame.sprite.Sprite):
                 pygame.draw.circle(surface, (255, 100, 0), proj_screen_rect.center, 10)
         
         safe_zone = pygame.Rect(
-            self.rect.x - 250,
-            self.rect.y + (self.display_height - self.safe_zone_height),
+            boss_rect.x - 250,
+            boss_rect.y + (self.display_height - self.safe_zone_height),
             250,
             self.safe_zone_height
         )
         safe_zone_screen = camera.apply(safe_zone)
         pygame.draw.rect(surface, (0, 255, 0), safe_zone_screen, 2)
         
-        font = pygame.font.Font(None, 20)
-        text = font.render("SAFE ZONE", True, (0, 255, 0))
+        font = get_font(20)
+        text = render_text(font, "SAFE ZONE", (0, 255, 0))
         surface.blit(text, (safe_zone_screen.x + 70, safe_zone_screen.centery))
 
 
 class BossProjectile:
+    # Hojas decodificadas y frames escalados compartidos por projectile_type
+    _sheets = {}
+    pool = None
+    
     def __init__(self, x, y, direction, projectile_type="flameball", angle_offset=0):
+        self.pooled = False
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, direction, projectile_type, angle_offset)
+    
+    def release(self):
+        BossProjectile.pool.release(self)
+    
+    def reset(self, x, y, direction, projectile_type="flameball", angle_offset=0):
         self.x = float(x)
         self.y = float(y)
         self.direction = direction
@@ -256,13 +309,13 @@ class BossProjectile:
         self.load_sprite()
         
         self.speed = 6
-        import math
         angle_rad = math.radians(angle_offset)
         
         self.vel_x = self.speed * direction
         self.vel_y = self.speed * math.sin(angle_rad)
         
-        self.rect = pygame.Rect(int(x), int(y), self.display_width, self.display_height)
+        self.rect.update(int(x), int(y), self.display_width, self.display_height)
+        self.prev_pos = self.rect.topleft
         
         self.current_frame = 0
         self.animation_speed = 5
@@ -271,10 +324,17 @@ class BossProjectile:
         self.lifetime = 180
         self.alive = True
     
-    def load_sprite(self):
+    @classmethod
+    def load_sheet(cls, projectile_type):
+        """Decodifica y pre-escala la hoja del tipo una sola vez; las siguientes balas la reutilizan."""
+        if projectile_type in cls._sheets:
+            return cls._sheets[projectile_type]
+        
         try:
-            sprite_path = f"assets/images/enemies/{self.projectile_type}.png"
-            self.sprite_sheet = pygame.image.load(sprite_path)
+            sprite_path = f"assets/images/enemies/{projectile_type}.png"
+            sprite_sheet = pygame.image.load(sprite_path)
+            if pygame.display.get_surface():
+                sprite_sheet = sprite_sheet.convert_alpha()
             
             dimensions = {
                 "acid2": (14, 67),
@@ -282,28 +342,50 @@ class BossProjectile:
                 "mage-bullet": (13, 13)
             }
             
-            self.frame_width, self.frame_height = dimensions.get(
-                self.projectile_type, (32, 32)
-            )
-            
-            sheet_width = self.sprite_sheet.get_width()
-            self.num_frames = sheet_width // self.frame_width
+            frame_width, frame_height = dimensions.get(projectile_type, (32, 32))
+            num_frames = sprite_sheet.get_width() // frame_width
+            scale_factor = 2.0
+            display_width = int(frame_width * scale_factor)
+            display_height = int(frame_height * scale_factor)
             
-            self.scale_factor = 2.0
-            self.display_width = int(self.frame_width * self.scale_factor)
-            self.display_height = int(self.frame_height * self.scale_factor)
+            frames = []
+            for i in range(num_frames):
+                frame = sprite_sheet.subsurface(
+                    pygame.Rect(i * frame_width, 0, frame_width, frame_height)
+                )
+                frames.append(pygame.transform.scale(frame, (display_width, display_height)))
             
-        except:
-            self.sprite_sheet = None
-            self.display_width = 20
-            self.display_height = 20
-            self.num_frames = 1
+            sheet = {
+                "sprite_sheet": sprite_sheet,
+                "frame_width": frame_width,
+                "frame_height": frame_height,
+                "num_frames": num_frames,
+                "scale_factor": scale_factor,
+                "display_width": display_width,
+                "display_height": display_height,
+                "frames": frames,
+            }
+        except Exception:
+            sheet = {
+                "sprite_sheet": None,
+                "display_width": 20,
+                "display_height": 20,
+                "num_frames": 1,
+            }
+        
+        cls._sheets[projectile_type] = sheet
+        return sheet
+    
+    def load_sprite(self):
+        for name, value in BossProjectile.load_sheet(self.projectile_type).items():
+            setattr(self, name, value)
     
     def update(self):
         self.lifetime -= 1
         if self.lifetime <= 0:
             self.alive = False
         
+        self.prev_pos = self.rect.topleft
         self.x += self.vel_x
         self.y += self.vel_y
         self.rect.x = int(self.x)
@@ -318,19 +400,14 @@ class BossProjectile:
         if not self.sprite_sheet:
             return None
         
-        frame_x = self.current_frame * self.frame_width
-        frame = self.sprite_sheet.subsurface(
-            pygame.Rect(frame_x, 0, self.frame_width, self.frame_height)
-        )
-        
-        return pygame.transform.scale(
-            frame,
-            (self.display_width, self.display_height)
-        )
+        return self.frames[self.current_frame]
     
     def draw(self, surface):
         frame = self.get_current_frame()
         if frame:
             surface.blit(frame, (self.rect.x, self.rect.y))
         else:
-            pygame.draw.circle(surface, (255, 100, 0), self.rect.center, 10)
\ No newline at end of file
+            pygame.draw.circle(surface, (255, 100, 0), self.rect.center, 10)
+
+
+BossProjectile.pool = ProjectilePool(BossProjectile)
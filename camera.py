@@ -1,5 +1,5 @@
 import pygame
-from config import WIDTH, HEIGHT
+from config import WIDTH, HEIGHT, CULL_MARGIN
 
 class Camera:
     def __init__(self, level_width, level_height):
@@ -10,13 +10,60 @@ class Camera:
         self.deadzone_width = WIDTH // 3
         self.deadzone_height = HEIGHT // 3
         
+        self.cull_margin = CULL_MARGIN
+        self.view = self.camera.inflate(self.cull_margin * 2, self.cull_margin * 2)
+        self.drawn_count = 0
+        self.culled_count = 0
+        
+        # Interpolacion entre los dos ultimos ticks (alpha = 1 dibuja el estado actual)
+        self.prev_pos = self.camera.topleft
+        self.alpha = 1.0
+        self.offset_x = self.camera.x
+        self.offset_y = self.camera.y
+    
+    def begin_frame(self, surface, alpha=1.0):
+        self.alpha = alpha
+        self.offset_x, self.offset_y = self.lerp_pos(self.camera.topleft, self.prev_pos)
+        
+        # Zona visible en coordenadas de mundo, con margen para sprites mas grandes que su rect
+        self.view = pygame.Rect((self.offset_x, self.offset_y), surface.get_size()).inflate(self.cull_margin * 2, self.cull_margin * 2)
+        self.drawn_count = 0
+        self.culled_count = 0
+    
+    def lerp_pos(self, pos, prev_pos):
+        if self.alpha >= 1.0 or pos == prev_pos:
+            return pos
+        return (round(prev_pos[0] + (pos[0] - prev_pos[0]) * self.alpha),
+                round(prev_pos[1] + (pos[1] - prev_pos[1]) * self.alpha))
+    
+    def lerp(self, rect, prev_pos):
+        """Rect en coordenadas de mundo en el instante que se esta dibujando."""
+        pos = self.lerp_pos(rect.topleft, prev_pos)
+        if pos == rect.topleft:
+            return rect
+        return pygame.Rect(pos, rect.size)
+    
+    def is_visible(self, rect):
+        if self.view.colliderect(rect):
+            self.drawn_count += 1
+            return True
+        self.culled_count += 1
+        return False
+        
     def apply(self, entity_rect):
-        return entity_rect.move(-self.camera.x, -self.camera.y)
+        return entity_rect.move(-self.offset_x, -self.offset_y)
     
     def apply_pos(self, x, y):
-        return (x - self.camera.x, y - self.camera.y)
+        return (x - self.offset_x, y - self.offset_y)
+    
+    def snap(self, target_rect):
+        """Coloca la camara sobre el objetivo sin interpolar desde la posicion anterior (al cargar un nivel)"""
+        self.update(target_rect)
+        self.prev_pos = self.camera.topleft
     
     def update(self, target_rect):
+        self.prev_pos = self.camera.topleft
+        
         player_center_x = target_rect.centerx
         player_center_y = target_rect.centery
         
@@ -34,4 +81,6 @@ class Camera:
             self.camera.y += player_center_y - (camera_center_y - self.deadzone_height // 2)
         
         self.camera.x = max(0, min(self.camera.x, self.width - WIDTH))
-        self.camera.y = max(0, min(self.camera.y, self.height - HEIGHT))
\ No newline at end of file
+        self.camera.y = max(0, min(self.camera.y, self.height - HEIGHT))
+        self.offset_x = self.camera.x
+        self.offset_y = self.camera.y
\ No newline at end of file
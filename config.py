@@ -1,6 +1,14 @@
+import os
 import pygame
 
-pygame.init()
+HEADLESS = os.environ.get("GAME_HEADLESS") == "1"
+if HEADLESS:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Solo el video: display.Info() lo necesita para el tamano de la ventana. Fuentes y
+# temporizador se inician al usarlos (text_cache, Game) y el resto no se usa
+pygame.display.init()
 display_info = pygame.display.Info()
 NATIVE_WIDTH = display_info.current_w
 NATIVE_HEIGHT = display_info.current_h
@@ -24,6 +32,25 @@ HEIGHT = (HEIGHT // TILE_SIZE) * TILE_SIZE
 
 FPS = 60
 
+# Menus y pausa: sin eventos durante MENU_IDLE_DELAY segundos, la animacion baja a MENU_IDLE_FPS
+MENU_IDLE_DELAY = 3.0
+MENU_IDLE_FPS = 10
+
+# Simulacion a paso fijo: TICK_RATE ticks por segundo, independiente de los FPS de render
+TICK_RATE = 60
+MAX_TICKS_PER_FRAME = 5
+MAX_FRAME_TIME = 0.25
+RENDER_FPS = 144  # 0 = sin limite
+
+CULL_MARGIN = 64
+
+# Simulacion de monstruos en arreglos NumPy (monster_system.py) en vez de un objeto por monstruo
+MONSTER_SYSTEM = os.environ.get("GAME_MONSTER_SYSTEM") == "1"
+
+# Niveles por chunks: solo se activan los que estan a STREAM_RADIUS chunks de la camara
+LEVEL_STREAMING = os.environ.get("GAME_LEVEL_STREAMING") == "1"
+STREAM_RADIUS = 2
+
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 GRAY = (100, 100, 100)
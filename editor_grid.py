@@ -0,0 +1,159 @@
+EDITOR_CHUNK = 32
+
+
+class EditorGrid:
+    """
+    Rejilla dispersa del editor: (col, row) -> caracter, guardada por chunks de
+    EDITOR_CHUNK x EDITOR_CHUNK celdas. Se usa como un dict y lleva la cuenta de
+    celdas por fila y columna para conocer los limites sin recorrer todo el mapa.
+    """
+
+    def __init__(self):
+        self.chunks = {}
+        self.count = 0
+        self.row_counts = {}
+        self.col_counts = {}
+        self._max_col = None
+        self._max_row = None
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __contains__(self, cell):
+        chunk = self.chunks.get((cell[0] // EDITOR_CHUNK, cell[1] // EDITOR_CHUNK))
+        return chunk is not None and cell in chunk
+
+    def __getitem__(self, cell):
+        value = self.get(cell)
+        if value is None:
+            raise KeyError(cell)
+        return value
+
+    def get(self, cell, default=None):
+        chunk = self.chunks.get((cell[0] // EDITOR_CHUNK, cell[1] // EDITOR_CHUNK))
+        if chunk is None:
+            return default
+        return chunk.get(cell, default)
+
+    def __setitem__(self, cell, char):
+        key = (cell[0] // EDITOR_CHUNK, cell[1] // EDITOR_CHUNK)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = {}
+        if cell not in chunk:
+            self.count += 1
+            self._add_bound(self.col_counts, cell[0])
+            self._add_bound(self.row_counts, cell[1])
+            if self._max_col is not None and cell[0] > self._max_col:
+                self._max_col = cell[0]
+            if self._max_row is not None and cell[1] > self._max_row:
+                self._max_row = cell[1]
+        chunk[cell] = char
+
+    def __delitem__(self, cell):
+        key = (cell[0] // EDITOR_CHUNK, cell[1] // EDITOR_CHUNK)
+        chunk = self.chunks.get(key)
+        if chunk is None or cell not in chunk:
+            raise KeyError(cell)
+        del chunk[cell]
+        if not chunk:
+            del self.chunks[key]
+
+        self.count -= 1
+        if self._remove_bound(self.col_counts, cell[0]) and cell[0] == self._max_col:
+            self._max_col = None
+        if self._remove_bound(self.row_counts, cell[1]) and cell[1] == self._max_row:
+            self._max_row = None
+
+    @staticmethod
+    def _add_bound(counts, value):
+        counts[value] = counts.get(value, 0) + 1
+
+    @staticmethod
+    def _remove_bound(counts, value):
+        """Devuelve True si ya no queda ninguna celda con ese valor"""
+        counts[value] -= 1
+        if counts[value] == 0:
+            del counts[value]
+            return True
+        return False
+
+    def max_col(self):
+        if self._max_col is None and self.col_counts:
+            self._max_col = max(self.col_counts)
+        return self._max_col
+
+    def max_row(self):
+        if self._max_row is None and self.row_counts:
+            self._max_row = max(self.row_counts)
+        return self._max_row
+
+    def items(self):
+        for chunk in self.chunks.values():
+            yield from chunk.items()
+
+    def keys(self):
+        for chunk in self.chunks.values():
+            yield from chunk
+
+    __iter__ = keys
+
+    def cells_in(self, start_col, start_row, end_col, end_row):
+        """Celdas ocupadas con start <= (col, row) < end, visitando solo los chunks que tocan"""
+        for cx in range(start_col // EDITOR_CHUNK, (end_col - 1) // EDITOR_CHUNK + 1):
+            for cy in range(start_row // EDITOR_CHUNK, (end_row - 1) // EDITOR_CHUNK + 1):
+                chunk = self.chunks.get((cx, cy))
+                if not chunk:
+                    continue
+                for (col, row), char in chunk.items():
+                    if start_col <= col < end_col and start_row <= row < end_row:
+                        yield (col, row), char
+
+    def write(self, f):
+        """
+        Escribe el nivel en formato de texto: filas 0..max_row, columnas 0..max_col,
+        cada linea sin espacios al final. Los huecos se emiten como tiradas de espacios.
+        """
+        max_col = self.max_col()
+        max_row = self.max_row()
+        if max_col is None:
+            return
+
+        # Chunks agrupados por banda de filas, para no ordenar todo el mapa de una vez
+        bands = {}
+        for (cx, cy), chunk in self.chunks.items():
+            if cy >= 0 and cx >= 0:
+                bands.setdefault(cy, []).append(chunk)
+
+        next_row = 0
+        for cy in sorted(bands):
+            cells = sorted(
+                (row, col, char)
+                for chunk in bands[cy]
+                for (col, row), char in chunk.items()
+            )
+
+            line = []
+            line_row = None
+            end_col = 0
+            for row, col, char in cells:
+                if row != line_row:
+                    if line_row is not None:
+                        f.write("".join(line).rstrip() + '\n')
+                        next_row = line_row + 1
+                    f.write('\n' * (row - next_row))
+                    line = []
+                    line_row = row
+                    end_col = 0
+                line.append(' ' * (col - end_col))
+                line.append(char)
+                end_col = col + 1
+
+            if line_row is not None:
+                f.write("".join(line).rstrip() + '\n')
+                next_row = line_row + 1
+
+        f.write('\n' * (max_row + 1 - next_row))
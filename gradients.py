@@ -0,0 +1,35 @@
+import numpy as np
+import pygame
+
+# Cada canal es (inicio, delta, divisor): valor = int(inicio + (y / alto) * delta) // divisor
+LEVEL_PALETTE = ((10, 30, 1), (20, 60, 1), (25, 40, 1))
+MENU_PALETTE = ((20, 40, 3), (20, 40, 3), (20, 40, 1))
+
+# Solo el ultimo tamano por (paleta, banda): al arrastrar el borde de la ventana cada
+# tamano nuevo reemplaza al anterior en vez de acumular superficies de pantalla completa
+_gradients = {}
+
+
+def gradient_colors(height, palette, band=1):
+    """Color (alto, 3) de cada fila; las filas de una misma banda toman el color de su primera fila"""
+    y = np.arange(height) // band * band
+    progress = y / height
+    columns = []
+    for start, delta, divisor in palette:
+        columns.append((start + progress * delta).astype(np.int64) // divisor)
+    return np.stack(columns, axis=1)
+
+
+def vertical_gradient(width, height, palette, band=1):
+    """Degradado vertical generado de una vez con surfarray; se reutiliza mientras no cambie el tamano."""
+    key = (palette, band)
+    cached = _gradients.get(key)
+    if cached is not None and cached.get_size() == (width, height):
+        return cached
+
+    surface = pygame.Surface((width, height))
+    if width > 0 and height > 0:
+        colors = gradient_colors(height, palette, band)
+        pygame.surfarray.blit_array(surface, np.broadcast_to(colors, (width, height, 3)))
+    _gradients[key] = surface
+    return surface
@@ -0,0 +1,123 @@
+import os
+import sys
+import time
+import argparse
+
+os.environ.setdefault("GAME_HEADLESS", "1")
+
+import pygame
+from main import Game
+
+KEY_NAMES = {
+    "left": pygame.K_LEFT,
+    "right": pygame.K_RIGHT,
+    "jump": pygame.K_SPACE,
+    "fire": pygame.K_f,
+}
+
+DEFAULT_SCRIPT = "right:90,right+jump:12,right:40,fire:10,left:30,right+jump:12"
+
+
+class ScriptedKeys:
+    def __init__(self, held):
+        self.held = held
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class ScriptedInput:
+    """Entrada guionizada: pasos (teclas, duracion en ticks) que se repiten en bucle."""
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.step_index = 0
+        self.step_tick = 0
+
+    @classmethod
+    def from_string(cls, script):
+        steps = []
+        for part in script.split(","):
+            names, _, duration = part.strip().partition(":")
+            keys = set()
+            for name in names.split("+"):
+                if name and name != "idle":
+                    keys.add(KEY_NAMES[name])
+            steps.append((keys, int(duration or 1)))
+        return cls(steps)
+
+    def get_pressed(self):
+        keys, _ = self.steps[self.step_index]
+        return ScriptedKeys(keys)
+
+    def get_keydowns(self):
+        keys, _ = self.steps[self.step_index]
+        if self.step_tick == 0:
+            return keys
+        return set()
+
+    def advance(self):
+        self.step_tick += 1
+        if self.step_tick >= self.steps[self.step_index][1]:
+            self.step_tick = 0
+            self.step_index = (self.step_index + 1) % len(self.steps)
+
+
+def create_game(level_file, input_source):
+    game = Game(headless=True, input_source=input_source)
+
+    if level_file not in game.level_order:
+        game.level_order.append(level_file)
+    game.load_level_by_index(game.level_order.index(level_file))
+
+    return game
+
+
+def run_headless(level_file, ticks, script=DEFAULT_SCRIPT):
+    input_source = ScriptedInput.from_string(script)
+    game = create_game(level_file, input_source)
+
+    ticks_run = 0
+    start = time.perf_counter()
+
+    while ticks_run < ticks and game.game_state in ("playing", "game_over"):
+        if game.game_state == "playing":
+            for key in input_source.get_keydowns():
+                game.handle_keypress(key)
+
+        game.simulate_tick()
+        input_source.advance()
+        ticks_run += 1
+
+    elapsed = time.perf_counter() - start
+
+    return {
+        "level": level_file,
+        "ticks": ticks_run,
+        "seconds": elapsed,
+        "ticks_per_second": ticks_run / elapsed if elapsed > 0 else 0.0,
+        "final_state": game.game_state,
+        "final_level": game.level_order[game.current_level_index] if game.level_order else None,
+        "monsters": game.level.monster_count() if game.level else 0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simula niveles sin ventana ni render")
+    parser.add_argument("levels", nargs="*", default=["levels/level1.txt"])
+    parser.add_argument("--ticks", type=int, default=3600)
+    parser.add_argument("--script", default=DEFAULT_SCRIPT,
+                        help="pasos 'teclas:ticks' separados por comas, p.ej. right+jump:10,left:30")
+    args = parser.parse_args(argv)
+
+    for level_file in args.levels:
+        result = run_headless(level_file, args.ticks, args.script)
+        print(f"{result['level']}: {result['ticks']} ticks en {result['seconds']:.3f}s "
+              f"-> {result['ticks_per_second']:.0f} ticks/s "
+              f"(estado: {result['final_state']}, nivel final: {result['final_level']})")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -2,51 +2,159 @@ import pygame
 import random
 import json
 import os
-from config import TILE_SIZE, WIDTH, HEIGHT
+import threading
+from config import TILE_SIZE, WIDTH, HEIGHT, MONSTER_SYSTEM, LEVEL_STREAMING
+from text_cache import get_font, render_text
+from spatial_hash import SpatialHash
+from level_compiler import load_level, load_custom_tiles, AUTOTILE_CHAR, STONE_CHAR
+from autotile import AUTOTILE_TYPES
+from level_stream import LevelStreamer, CHUNK_SIZE
+from gradients import vertical_gradient, LEVEL_PALETTE
+import startup_profile
+
+MOSSY_DIR = "assets/images/tiles/Mossy"
+TILESET_TILE = 512
+
+# Posicion (fila, columna) de cada tile de autotile en el tileset
+BASE_TILES = {
+    'center': (1, 1),
+    'top': (0, 1),
+    'bottom': (2, 1),
+    'left': (1, 0),
+    'right': (1, 2),
+    'top_left': (0, 0),
+    'top_right': (0, 2),
+    'bottom_left': (2, 0),
+    'bottom_right': (2, 2),
+    'stone': (3, 1),
+}
+
+def mossy_path(name):
+    for ext in ['.png', '.jpg']:
+        path = f"{MOSSY_DIR}/Mossy - {name}{ext}"
+        if os.path.exists(path):
+            return path
+    return None
+
 
 class Level:
+    use_monster_system = MONSTER_SYSTEM
+    streaming = LEVEL_STREAMING
+    
+    # Recursos compartidos entre niveles: se cargan una vez por proceso
+    _tiles = {}
+    _tileset = None
+    _sheets = {}
+    _decorations = None
+    _background_layers = None
+    
     def __init__(self, level_file):
         self.platforms = []
         self.platform_grid = {}
+        self.tile_bounds = None
+        self.streamer = None
         self.goal = None
         self.boss = None
         self.player_spawn = (100, 100)
         
         self.monsters = []
+        self.monster_hash = SpatialHash()
+        self.monster_hash_dirty = True
+        self.monster_system = None
+        if self.use_monster_system:
+            from monster_system import MonsterSystem
+            self.monster_system = MonsterSystem()
         self.monster_spawns = []
         self.dead_monsters_count = 0
         self.spawn_cooldown = 0
         
         self.load_background_layers()
+        startup_profile.mark("fondo")
         self.load_tileset()
+        startup_profile.mark("tileset")
         self.load_decorations()
+        startup_profile.mark("decoraciones")
         
+        # Los tipos de autotile ya vienen precalculados en el nivel compilado
         self.load_from_file(level_file)
-        self.build_autotiles()
-        self.place_decorations()
+        if self.monster_system is not None:
+            self.monster_system.build_solid_grid(self)
+        startup_profile.mark("nivel compilado")
+        
+        if self.streamer is not None:
+            # Solo se crean y hornean los chunks cercanos; el resto al acercarse la camara
+            self.placed_decorations = []
+            self.streamer.place_decorations()
+            self.streamer.update(self.streamer.spawn_view())
+        else:
+            self.place_decorations()
+            self.bake_chunks()
+        startup_profile.mark("horneado de chunks")
     
-    def load_background_layers(self):
-        self.bg_decor_original = None
-        self.hills_original = None
+    @classmethod
+    def preload_steps(cls):
+        """
+        Llena las caches de clase (fondo, tiles, decoraciones) por pasos cortos, uno por
+        frame del menu inactivo. Las hojas grandes se decodifican en un hilo (pygame.image.load
+        suelta el GIL) y el paso solo espera a que terminen sin bloquear el menu.
+        """
+        sheets = []
+        if Level._background_layers is None:
+            sheets += ["Background Decoration", "MossyHills"]
+        if any(position not in Level._tiles for position in cls.tile_positions()):
+            sheets.append("TileSet")
+        if Level._decorations is None:
+            sheets += ["Hanging Plants", "Decorations&Hazards"]
+        
+        for name in sheets:
+            path = mossy_path(name)
+            if path is None:
+                continue
+            result = []
+            thread = threading.Thread(target=lambda: result.append(pygame.image.load(path)), daemon=True)
+            thread.start()
+            while thread.is_alive():
+                yield
+            if result:
+                Level._sheets[name] = result[0]
+            yield
         
+        cls.background_layers()
+        yield
         try:
-            extensiones = ['.png', '.jpg']
-            
-            for ext in extensiones:
-                if os.path.exists(f"assets/images/tiles/Mossy/Mossy - Background Decoration{ext}"):
-                    self.bg_decor_original = pygame.image.load(f"assets/images/tiles/Mossy/Mossy - Background Decoration{ext}")
-                    break
-            
-            for ext in extensiones:
-                if os.path.exists(f"assets/images/tiles/Mossy/Mossy - MossyHills{ext}"):
-                    self.hills_original = pygame.image.load(f"assets/images/tiles/Mossy/Mossy - MossyHills{ext}")
-                    break
-
-            self.handle_resize(WIDTH, HEIGHT)
-            
+            for row, col in cls.tile_positions():
+                cls.cached_tile(row, col)
+                yield
         except Exception:
-            self.bg_decor_original = None
-            self.handle_resize(WIDTH, HEIGHT)
+            pass
+        finally:
+            Level._tileset = None
+        cls.shared_decorations()
+        # Lo que no se llego a usar (p. ej. un nivel se cargo mientras tanto) no se retiene
+        Level._sheets.clear()
+    
+    @staticmethod
+    def take_sheet(name):
+        """Imagen 'Mossy - <name>', ya decodificada por preload_steps o cargada ahora; None si falta"""
+        image = Level._sheets.pop(name, None)
+        if image is None:
+            path = mossy_path(name)
+            if path is not None:
+                try:
+                    image = pygame.image.load(path)
+                except Exception:
+                    image = None
+        return image
+    
+    @classmethod
+    def background_layers(cls):
+        if Level._background_layers is None:
+            Level._background_layers = (cls.take_sheet("Background Decoration"), cls.take_sheet("MossyHills"))
+        return Level._background_layers
+    
+    def load_background_layers(self):
+        self.bg_decor_original, self.hills_original = self.background_layers()
+        self.handle_resize(WIDTH, HEIGHT)
 
     def handle_resize(self, new_width, new_height):
         if self.bg_decor_original:
@@ -55,43 +163,24 @@ class Level:
                 hills_scaled = pygame.transform.scale(self.hills_original, (new_width, new_height // 2))
                 self.background.blit(hills_scaled, (0, new_height // 2))
         else:
-            self.background = pygame.Surface((new_width, new_height))
-            for y in range(new_height):
-                progress = y / new_height
-                r = int(10 + progress * 30)
-                g = int(20 + progress * 60)
-                b = int(25 + progress * 40)
-                pygame.draw.line(self.background, (r, g, b), (0, y), (new_width, y))
+            self.background = vertical_gradient(new_width, new_height, LEVEL_PALETTE)
+    
+    @staticmethod
+    def tile_positions():
+        """(fila, columna) de los tiles base y de los de tile_map.json"""
+        positions = list(BASE_TILES.values())
+        try:
+            for data in load_custom_tiles().values():
+                positions.append((data.get('row', 0), data.get('col', 0)))
+        except Exception:
+            pass
+        return positions
     
     def load_tileset(self):
+        # Los tiles recortados quedan en Level._tiles: el tileset (3584x3584) solo se
+        # vuelve a abrir si tile_map.json pide una posicion que aun no se recorto
         try:
-            extensiones = ['.png', '.jpg']
-            tileset = None
-            
-            for ext in extensiones:
-                try:
-                    tileset = pygame.image.load(f"assets/images/tiles/Mossy/Mossy - TileSet{ext}")
-                    break
-                except:
-                    continue
-            
-            if not tileset:
-                raise Exception()
-            
-            tile_size = 512
-            
-            self.tile_images = {
-                'center': self.extract_tile(tileset, 1, 1, tile_size),
-                'top': self.extract_tile(tileset, 0, 1, tile_size),
-                'bottom': self.extract_tile(tileset, 2, 1, tile_size),
-                'left': self.extract_tile(tileset, 1, 0, tile_size),
-                'right': self.extract_tile(tileset, 1, 2, tile_size),
-                'top_left': self.extract_tile(tileset, 0, 0, tile_size),
-                'top_right': self.extract_tile(tileset, 0, 2, tile_size),
-                'bottom_left': self.extract_tile(tileset, 2, 0, tile_size),
-                'bottom_right': self.extract_tile(tileset, 2, 2, tile_size),
-                'stone': self.extract_tile(tileset, 3, 1, tile_size)
-            }
+            self.tile_images = {name: self.cached_tile(row, col) for name, (row, col) in BASE_TILES.items()}
             
             self.custom_tiles = {}
             if os.path.exists("tile_map.json"):
@@ -102,34 +191,40 @@ class Level:
                         for char, data in self.custom_tiles.items():
                             row = data.get('row', 0)
                             col = data.get('col', 0)
-                            self.tile_images[char] = self.extract_tile(tileset, row, col, tile_size)
+                            self.tile_images[char] = self.cached_tile(row, col)
                 except Exception:
                     pass
             
         except Exception:
             self.tile_images = None
+        finally:
+            Level._tileset = None
+    
+    @classmethod
+    def cached_tile(cls, row, col):
+        tile = Level._tiles.get((row, col))
+        if tile is None:
+            if Level._tileset is None:
+                Level._tileset = cls.take_sheet("TileSet")
+                if not Level._tileset:
+                    raise Exception()
+            
+            tile = cls.extract_tile(Level._tileset, row, col, TILESET_TILE)
+            Level._tiles[(row, col)] = tile
+        return tile
     
     def load_decorations(self):
+        self.decorations = self.shared_decorations()
+    
+    @classmethod
+    def shared_decorations(cls):
+        if Level._decorations is not None:
+            return Level._decorations
+        
+        decorations_list = []
         try:
-            extensiones = ['.png', '.jpg']
-            
-            hanging_plants = None
-            for ext in extensiones:
-                try:
-                    hanging_plants = pygame.image.load(f"assets/images/tiles/Mossy/Mossy - Hanging Plants{ext}")
-                    break
-                except:
-                    continue
-            
-            decorations = None
-            for ext in extensiones:
-                try:
-                    decorations = pygame.image.load(f"assets/images/tiles/Mossy/Mossy - Decorations&Hazards{ext}")
-                    break
-                except:
-                    continue
-            
-            self.decorations = []
+            hanging_plants = cls.take_sheet("Hanging Plants")
+            decorations = cls.take_sheet("Decorations&Hazards")
             
             if hanging_plants:
                 plant_size = 256
@@ -137,7 +232,7 @@ class Level:
                     try:
                         plant = hanging_plants.subsurface(pygame.Rect(i * plant_size, 0, plant_size, plant_size))
                         plant_scaled = pygame.transform.scale(plant, (48, 48))
-                        self.decorations.append(plant_scaled)
+                        decorations_list.append(plant_scaled)
                     except:
                         pass
             
@@ -147,14 +242,17 @@ class Level:
                     try:
                         dec = decorations.subsurface(pygame.Rect(i * dec_size, 0, dec_size, dec_size))
                         dec_scaled = pygame.transform.scale(dec, (32, 32))
-                        self.decorations.append(dec_scaled)
+                        decorations_list.append(dec_scaled)
                     except:
                         pass
             
         except Exception:
-            self.decorations = []
+            decorations_list = []
+        Level._decorations = decorations_list
+        return decorations_list
     
-    def extract_tile(self, sheet, row, col, tile_size):
+    @staticmethod
+    def extract_tile(sheet, row, col, tile_size):
         x = col * tile_size
         y = row * tile_size
         
@@ -162,98 +260,99 @@ class Level:
         return pygame.transform.scale(tile, (TILE_SIZE, TILE_SIZE))
     
     def load_from_file(self, filename):
-        try:
-            with open(filename, 'r') as f:
-                lines = f.readlines()
-                for row, line in enumerate(lines):
-                    for col, char in enumerate(line):
-                        x = col * TILE_SIZE
-                        y = row * TILE_SIZE
-                        
-                        if char == '#':
-                            self.platform_grid[(col, row)] = True
-                            platform = {
-                                'rect': pygame.Rect(x, y, TILE_SIZE, TILE_SIZE),
-                                'grid_pos': (col, row),
-                                'tile_type': 'center',
-                                'is_manual': False
-                            }
-                            self.platforms.append(platform)
-                        elif char == 'S':
-                            self.platform_grid[(col, row)] = True
-                            platform = {
-                                'rect': pygame.Rect(x, y, TILE_SIZE, TILE_SIZE),
-                                'grid_pos': (col, row),
-                                'tile_type': 'stone',
-                                'is_manual': True
-                            }
-                            self.platforms.append(platform)
-                        elif char == 'G':
-                            self.goal = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-                        elif char == 'B':
-                            from boss import Boss
-                            self.boss = Boss(x, y, boss_type="gnu")
-                        elif char == 'U':
-                            from undead_executioner import UndeadExecutioner
-                            self.boss = UndeadExecutioner(x, y)
-                        elif char == 'M':
-                            self.monster_spawns.append((x, y))
-                        elif char == 'E':
-                            from monster import Monster
-                            self.monsters.append(Monster(x, y, "flying_eye"))
-                        elif char == 'O':
-                            from monster import Monster
-                            self.monsters.append(Monster(x, y, "goblin"))
-                        elif char == 'K':
-                            from monster import Monster
-                            self.monsters.append(Monster(x, y, "skeleton"))
-                        elif char == 'H':
-                            from monster import Monster
-                            self.monsters.append(Monster(x, y, "mushroom"))
-                        elif char == 'P':
-                            self.player_spawn = (x, y)
-                        elif char in self.custom_tiles:
-                            self.platform_grid[(col, row)] = True
-                            platform = {
-                                'rect': pygame.Rect(x, y, TILE_SIZE, TILE_SIZE),
-                                'grid_pos': (col, row),
-                                'tile_type': char,
-                                'is_manual': True
-                            }
-                            self.platforms.append(platform)
-        except FileNotFoundError:
-            raise
-    
-    def build_autotiles(self):
-        for platform in self.platforms:
-            if platform.get('is_manual'):
-                continue
-                
-            col, row = platform['grid_pos']
-            
-            has_top = (col, row - 1) in self.platform_grid
-            has_bottom = (col, row + 1) in self.platform_grid
-            has_left = (col - 1, row) in self.platform_grid
-            has_right = (col + 1, row) in self.platform_grid
-            
-            if not has_top and not has_left:
-                platform['tile_type'] = 'top_left'
-            elif not has_top and not has_right:
-                platform['tile_type'] = 'top_right'
-            elif not has_bottom and not has_left:
-                platform['tile_type'] = 'bottom_left'
-            elif not has_bottom and not has_right:
-                platform['tile_type'] = 'bottom_right'
-            elif not has_top:
-                platform['tile_type'] = 'top'
-            elif not has_bottom:
-                platform['tile_type'] = 'bottom'
-            elif not has_left:
-                platform['tile_type'] = 'left'
-            elif not has_right:
-                platform['tile_type'] = 'right'
-            else:
-                platform['tile_type'] = 'center'
+        # El texto se compila una vez a levels/*.lvlc y se abre como memory map
+        compiled = load_level(filename, getattr(self, 'custom_tiles', {}))
+        self.tile_bounds = compiled.bounds()
+        
+        if self.streaming:
+            # Los tiles se quedan en el nivel compilado hasta que su chunk se activa
+            self.streamer = LevelStreamer(self, compiled)
+        else:
+            for col, row, code, type_index in zip(*compiled.tile_positions()):
+                platform = self.make_platform(col, row, code, type_index)
+                self.platforms.append(platform)
+                self.platform_grid[(col, row)] = platform
+        
+        for char, col, row in compiled.entities.tolist():
+            self.place_entity(chr(char), col * TILE_SIZE, row * TILE_SIZE)
+    
+    def make_platform(self, col, row, code, type_index):
+        if code == AUTOTILE_CHAR:
+            tile_type = AUTOTILE_TYPES[type_index]
+        elif code == STONE_CHAR:
+            tile_type = 'stone'
+        else:
+            tile_type = chr(code)
+        
+        return {
+            'rect': pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE),
+            'grid_pos': (col, row),
+            'tile_type': tile_type,
+            'is_manual': code != AUTOTILE_CHAR
+        }
+    
+    def place_entity(self, char, x, y):
+        if char == 'G':
+            self.goal = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
+        elif char == 'B':
+            from boss import Boss
+            self.boss = Boss(x, y, boss_type="gnu")
+        elif char == 'U':
+            from undead_executioner import UndeadExecutioner
+            self.boss = UndeadExecutioner(x, y)
+        elif char == 'M':
+            self.monster_spawns.append((x, y))
+        elif char == 'E':
+            self.add_monster(x, y, "flying_eye")
+        elif char == 'O':
+            self.add_monster(x, y, "goblin")
+        elif char == 'K':
+            self.add_monster(x, y, "skeleton")
+        elif char == 'H':
+            self.add_monster(x, y, "mushroom")
+        elif char == 'P':
+            self.player_spawn = (x, y)
+    
+    def colliding_tiles(self, rect):
+        # Solo revisa las celdas que cubre el rect, en el mismo orden que self.platforms.
+        # El rect puede moverse entre iteraciones; cada celda se prueba con su posicion actual.
+        row = rect.top // TILE_SIZE
+        while row <= (rect.bottom - 1) // TILE_SIZE:
+            col = rect.left // TILE_SIZE
+            while col <= (rect.right - 1) // TILE_SIZE:
+                platform = self.platform_grid.get((col, row))
+                if platform and rect.colliderect(platform['rect']):
+                    yield platform['rect']
+                col += 1
+            row += 1
+    
+    def collides(self, rect):
+        for _ in self.colliding_tiles(rect):
+            return True
+        return False
+    
+    def resolve_horizontal(self, body):
+        for platform_rect in self.colliding_tiles(body.rect):
+            if body.vel_x > 0:
+                body.rect.right = platform_rect.left
+                body.x = body.rect.x
+            elif body.vel_x < 0:
+                body.rect.left = platform_rect.right
+                body.x = body.rect.x
+    
+    def resolve_vertical(self, body):
+        landed = False
+        for platform_rect in self.colliding_tiles(body.rect):
+            if body.vel_y > 0:
+                body.rect.bottom = platform_rect.top
+                body.y = body.rect.y
+                body.vel_y = 0
+                landed = True
+            elif body.vel_y < 0:
+                body.rect.top = platform_rect.bottom
+                body.y = body.rect.y
+                body.vel_y = 0
+        return landed
     
     def place_decorations(self):
         self.placed_decorations = []
@@ -275,14 +374,85 @@ class Level:
                         'layer': 'front'
                     })
     
+    def bake_chunks(self):
+        # Pre-renderiza tiles y decoraciones estaticas en bloques de CHUNK_TILES x CHUNK_TILES.
+        # Se componen en alpha premultiplicado para que el resultado sea igual a dibujarlos uno a uno.
+        self.back_chunks = {}
+        self.front_chunks = {}
+        self._premultiplied = {}
+        
+        for dec in self.placed_decorations:
+            if dec.get('layer') == 'back':
+                self.bake_image(self.back_chunks, dec['image'], dec['pos'])
+        
+        for platform in self.platforms:
+            self.bake_tile(platform)
+        
+        for dec in self.placed_decorations:
+            if dec.get('layer') == 'front':
+                self.bake_image(self.front_chunks, dec['image'], dec['pos'])
+        
+        self._premultiplied = {}
+    
+    def bake_tile(self, platform):
+        rect = platform['rect']
+        tile_type = platform.get('tile_type', 'center')
+        if self.tile_images and tile_type in self.tile_images:
+            self.bake_image(self.back_chunks, self.tile_images[tile_type], rect.topleft)
+        else:
+            cx, cy = rect.x // CHUNK_SIZE, rect.y // CHUNK_SIZE
+            chunk = self.get_chunk(self.back_chunks, cx, cy)
+            local_rect = rect.move(-cx * CHUNK_SIZE, -cy * CHUNK_SIZE)
+            pygame.draw.rect(chunk, (0, 0, 0), local_rect)
+            pygame.draw.rect(chunk, (50, 50, 50), local_rect, 1)
+    
+    def get_chunk(self, chunks, cx, cy):
+        chunk = chunks.get((cx, cy))
+        if chunk is None:
+            chunk = pygame.Surface((CHUNK_SIZE, CHUNK_SIZE), pygame.SRCALPHA)
+            chunks[(cx, cy)] = chunk
+        return chunk
+    
+    def bake_image(self, chunks, image, pos, only=None):
+        premultiplied = self._premultiplied.get(id(image))
+        if premultiplied is None:
+            if image.get_flags() & pygame.SRCALPHA:
+                premultiplied = image.premul_alpha()
+            else:
+                premultiplied = image
+            self._premultiplied[id(image)] = premultiplied
+        
+        x, y = pos
+        w, h = image.get_size()
+        for cx in range(x // CHUNK_SIZE, (x + w - 1) // CHUNK_SIZE + 1):
+            for cy in range(y // CHUNK_SIZE, (y + h - 1) // CHUNK_SIZE + 1):
+                if only is not None and (cx, cy) != only:
+                    continue
+                chunk = self.get_chunk(chunks, cx, cy)
+                chunk.blit(premultiplied, (x - cx * CHUNK_SIZE, y - cy * CHUNK_SIZE),
+                           special_flags=pygame.BLEND_PREMULTIPLIED)
+    
+    def draw_chunks(self, surface, camera, chunks):
+        view = pygame.Rect((camera.offset_x, camera.offset_y), surface.get_size())
+        drawn = 0
+        
+        for cx in range(view.left // CHUNK_SIZE, (view.right - 1) // CHUNK_SIZE + 1):
+            for cy in range(view.top // CHUNK_SIZE, (view.bottom - 1) // CHUNK_SIZE + 1):
+                chunk = chunks.get((cx, cy))
+                if chunk:
+                    pos = camera.apply_pos(cx * CHUNK_SIZE, cy * CHUNK_SIZE)
+                    surface.blit(chunk, pos, special_flags=pygame.BLEND_PREMULTIPLIED)
+                    drawn += 1
+        
+        self.chunks_drawn += drawn
+        camera.drawn_count += drawn
+        camera.culled_count += len(chunks) - drawn
+    
     def get_dimensions(self):
-        if not self.platforms:
+        if not self.tile_bounds:
             return (WIDTH, HEIGHT)
         
-        max_x = max(p['rect'].right if isinstance(p, dict) else p.right 
-                    for p in self.platforms)
-        max_y = max(p['rect'].bottom if isinstance(p, dict) else p.bottom 
-                    for p in self.platforms)
+        max_x, max_y = self.tile_bounds
         
         level_width = max(max_x + 200, WIDTH)
         level_height = max(max_y + 200, HEIGHT)
@@ -294,9 +464,46 @@ class Level:
             return True
         return False
     
-    def spawn_monsters(self):
-        from monster import Monster
+    def add_monster(self, x, y, monster_type):
+        if self.monster_system is not None:
+            self.monster_system.add(x, y, monster_type)
+        else:
+            from monster import Monster
+            self.monsters.append(Monster(x, y, monster_type))
+            self.monster_hash_dirty = True
+    
+    def monster_count(self):
+        if self.monster_system is not None:
+            return len(self.monster_system)
+        return len(self.monsters)
+    
+    def hit_monster(self, rect):
+        # Daña al primer monstruo (en orden de aparicion) que toca rect
+        if self.monster_system is not None:
+            index = self.monster_system.hit_test(rect)
+            if index < 0:
+                return False
+            self.monster_system.take_damage(index)
+            return True
         
+        if self.monster_hash_dirty:
+            self.build_monster_hash()
+        
+        for monster in self.monster_hash.query(rect):
+            if not monster.is_dying:
+                monster.take_damage()
+                return True
+        return False
+    
+    def build_monster_hash(self):
+        # Se arma una vez por tick, en la primera prueba de impacto tras mover a los monstruos
+        self.monster_hash.clear()
+        for monster in self.monsters:
+            if not monster.is_dying:
+                self.monster_hash.insert(monster.rect, monster)
+        self.monster_hash_dirty = False
+    
+    def spawn_monsters(self):
         if not self.monster_spawns:
             return
         
@@ -306,12 +513,9 @@ class Level:
         for i in range(monsters_to_spawn):
             spawn_pos = self.monster_spawns[i % len(self.monster_spawns)]
             monster_type = random.choice(monster_types)
-            monster = Monster(spawn_pos[0], spawn_pos[1], monster_type)
-            self.monsters.append(monster)
+            self.add_monster(spawn_pos[0], spawn_pos[1], monster_type)
     
     def spawn_new_monsters(self, count=2):
-        from monster import Monster
-        
         if not self.monster_spawns:
             return
         
@@ -320,10 +524,14 @@ class Level:
         for _ in range(count):
             spawn_pos = random.choice(self.monster_spawns)
             monster_type = random.choice(monster_types)
-            monster = Monster(spawn_pos[0], spawn_pos[1], monster_type)
-            self.monsters.append(monster)
+            self.add_monster(spawn_pos[0], spawn_pos[1], monster_type)
     
     def update(self, player, game=None):
+        self.monster_hash_dirty = True
+        
+        if self.streamer is not None and game is not None and game.camera is not None:
+            self.streamer.update(game.camera.camera)
+        
         if self.boss:
             self.boss.update()
             
@@ -334,10 +542,22 @@ class Level:
                 player.take_damage()
                 return "hit"
         
-        if self.monsters and game:
+        if self.monster_system is not None:
+            if len(self.monster_system) and game:
+                hit_player, removed = self.monster_system.update(player, game.current_color == "background")
+                if removed:
+                    self.dead_monsters_count += removed
+                    self.spawn_cooldown = 180
+                
+                if hit_player:
+                    return "game_over"
+                
+                self.update_spawn_cooldown()
+        
+        elif self.monsters and game:
             for monster in self.monsters[:]:
                 monster.update_ai(player, game)
-                monster.update_movement(self.platforms)
+                monster.update_movement(self)
                 
                 if monster.check_collision_with_player(player):
                     return "game_over"
@@ -347,33 +567,22 @@ class Level:
                     self.dead_monsters_count += 1
                     self.spawn_cooldown = 180
             
-            if self.spawn_cooldown > 0:
-                self.spawn_cooldown -= 1
-                if self.spawn_cooldown == 0:
-                    self.spawn_new_monsters(2)
+            self.update_spawn_cooldown()
         
         return None
     
+    def update_spawn_cooldown(self):
+        if self.spawn_cooldown > 0:
+            self.spawn_cooldown -= 1
+            if self.spawn_cooldown == 0:
+                self.spawn_new_monsters(2)
+    
     def draw_background(self, surface):
         surface.blit(self.background, (0, 0))
     
     def draw_with_camera(self, surface, camera):
-        for dec in self.placed_decorations:
-            if dec.get('layer') == 'back':
-                pos = camera.apply_pos(dec['pos'][0], dec['pos'][1])
-                surface.blit(dec['image'], pos)
-        
-        for platform in self.platforms:
-            rect = platform['rect']
-            screen_rect = camera.apply(rect)
-            
-            tile_type = platform.get('tile_type', 'center')
-            if self.tile_images and tile_type in self.tile_images:
-                image = self.tile_images[tile_type]
-                surface.blit(image, screen_rect)
-            else:
-                pygame.draw.rect(surface, (0, 0, 0), screen_rect)
-                pygame.draw.rect(surface, (50, 50, 50), screen_rect, 1)
+        self.chunks_drawn = 0
+        self.draw_chunks(surface, camera, self.back_chunks)
 
         if self.goal:
             goal_rect = camera.apply(self.goal)
@@ -390,12 +599,12 @@ class Level:
             pygame.draw.rect(surface, (50, 255, 150), goal_rect)
             pygame.draw.rect(surface, (0, 200, 100), goal_rect, 5)
             
-            font = pygame.font.Font(None, 35)
-            text = font.render("GOAL", True, (0, 0, 0))
+            font = get_font(35)
+            text = render_text(font, "GOAL", (0, 0, 0))
             text_rect = text.get_rect(center=(goal_rect.centerx + 2, goal_rect.centery + 2))
             surface.blit(text, text_rect)
             
-            text = font.render("GOAL", True, (255, 255, 255))
+            text = render_text(font, "GOAL", (255, 255, 255))
             text_rect = text.get_rect(center=goal_rect.center)
             surface.blit(text, text_rect)
         
@@ -403,13 +612,12 @@ class Level:
             self.boss.draw_with_camera(surface, camera)
         
         for monster in self.monsters:
-            if monster.alive:
+            if monster.alive and camera.is_visible(monster.rect):
                 monster.draw_with_camera(surface, camera)
+        if self.monster_system is not None:
+            self.monster_system.draw_with_camera(surface, camera)
         
-        for dec in self.placed_decorations:
-            if dec.get('layer') == 'front':
-                pos = camera.apply_pos(dec['pos'][0], dec['pos'][1])
-                surface.blit(dec['image'], pos)
+        self.draw_chunks(surface, camera, self.front_chunks)
     
     def draw(self, surface):
         surface.blit(self.background, (0, 0))
@@ -427,8 +635,8 @@ class Level:
             pygame.draw.rect(surface, (50, 255, 150), self.goal)
             pygame.draw.rect(surface, (0, 200, 100), self.goal, 4)
             
-            font = pygame.font.Font(None, 30)
-            text = font.render("GOAL", True, (255, 255, 255))
+            font = get_font(30)
+            text = render_text(font, "GOAL", (255, 255, 255))
             text_rect = text.get_rect(center=self.goal.center)
             surface.blit(text, text_rect)
         
@@ -0,0 +1,199 @@
+"""
+Compila los niveles de texto (levels/*.txt) a un formato binario compacto.
+
+El binario (.lvlc) se guarda junto al archivo fuente y contiene:
+    - cabecera con la version, mtime/tamano/hash del fuente y las dimensiones
+    - rejilla uint8 de tiles (0 = vacio, si no el caracter del tile)
+    - rejilla uint8 con el tipo de autotile precalculado
+    - tabla de entidades (caracter, columna, fila) en el orden del archivo
+
+Level lo abre con un memory map; solo se recompila cuando cambia el fuente.
+
+Uso: python level_compiler.py [levels/level1.txt ...]
+"""
+
+import os
+import sys
+import glob
+import json
+import mmap
+import struct
+import hashlib
+import numpy as np
+from config import TILE_SIZE
+from autotile import classify_grid
+
+MAGIC = b"LVLC"
+VERSION = 1
+EXTENSION = ".lvlc"
+
+HEADER = struct.Struct("<4sHHqq32s32sIIIii")
+
+ENTITY_DTYPE = np.dtype([('char', 'u1'), ('col', '<u4'), ('row', '<u4')])
+
+# Caracteres que Level interpreta antes que los tiles personalizados
+ENTITY_CHARS = "GBUMEOKHP"
+AUTOTILE_CHAR = ord('#')
+STONE_CHAR = ord('S')
+
+def compiled_path(source_path):
+    return os.path.splitext(source_path)[0] + EXTENSION
+
+
+def tile_chars(custom_tiles):
+    """Codigos de los caracteres que son tile, en el mismo orden de prioridad que Level"""
+    chars = {AUTOTILE_CHAR, STONE_CHAR}
+    for char in custom_tiles:
+        if len(char) == 1 and char.isascii() and char not in ENTITY_CHARS:
+            chars.add(ord(char))
+    return sorted(chars)
+
+
+def tiles_signature(custom_tiles):
+    key = f"{TILE_SIZE}:{''.join(map(chr, tile_chars(custom_tiles)))}"
+    return hashlib.sha256(key.encode("utf-8")).digest()
+
+
+def parse_text(text):
+    """Rejilla uint8 con un byte por caracter (filas rellenadas con espacios)"""
+    lines = text.split('\n')
+    width = max((len(line) for line in lines), default=0)
+    # 'replace' deja un byte por caracter no ASCII, asi las columnas coinciden con el texto
+    data = b''.join(line.encode('ascii', 'replace').ljust(width) for line in lines)
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(lines), width)
+
+
+def compile_source(source_bytes, custom_tiles, mtime_ns=0):
+    """Devuelve el contenido binario del nivel"""
+    text = source_bytes.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    grid = parse_text(text)
+
+    is_tile = np.isin(grid, tile_chars(custom_tiles))
+    tiles = np.where(is_tile, grid, 0).astype(np.uint8)
+    tile_types = classify_grid(is_tile)
+
+    is_entity = np.isin(grid, np.frombuffer(ENTITY_CHARS.encode('ascii'), dtype=np.uint8))
+    rows, cols = np.nonzero(is_entity)
+    entities = np.empty(len(rows), dtype=ENTITY_DTYPE)
+    entities['char'] = grid[rows, cols]
+    entities['col'] = cols
+    entities['row'] = rows
+
+    tile_rows, tile_cols = np.nonzero(is_tile)
+    max_col = int(tile_cols.max()) if len(tile_cols) else -1
+    max_row = int(tile_rows.max()) if len(tile_rows) else -1
+
+    header = HEADER.pack(
+        MAGIC, VERSION, TILE_SIZE, mtime_ns, len(source_bytes),
+        hashlib.sha256(source_bytes).digest(), tiles_signature(custom_tiles),
+        grid.shape[1], grid.shape[0], len(entities), max_col, max_row,
+    )
+    return header + tiles.tobytes() + tile_types.tobytes() + entities.tobytes()
+
+
+class CompiledLevel:
+    """Vista de solo lectura sobre un nivel compilado (memory map o bytes)"""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        (magic, version, tile_size, self.source_mtime_ns, self.source_size,
+         self.source_hash, self.signature, self.cols, self.rows,
+         entity_count, self.max_col, self.max_row) = HEADER.unpack_from(buffer, 0)
+
+        if magic != MAGIC or version != VERSION or tile_size != TILE_SIZE:
+            raise ValueError("nivel compilado incompatible")
+
+        cells = self.cols * self.rows
+        offset = HEADER.size
+        self.tiles = np.frombuffer(buffer, np.uint8, cells, offset).reshape(self.rows, self.cols)
+        offset += cells
+        self.tile_types = np.frombuffer(buffer, np.uint8, cells, offset).reshape(self.rows, self.cols)
+        offset += cells
+        self.entities = np.frombuffer(buffer, ENTITY_DTYPE, entity_count, offset)
+
+    @classmethod
+    def open(cls, path):
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    def matches(self, stat, custom_tiles):
+        return (self.source_mtime_ns == stat.st_mtime_ns
+                and self.source_size == stat.st_size
+                and self.signature == tiles_signature(custom_tiles))
+
+    def tile_positions(self):
+        """(columnas, filas, codigos, tipos) de cada tile, en orden fila por fila"""
+        rows, cols = np.nonzero(self.tiles)
+        return (cols.tolist(), rows.tolist(),
+                self.tiles[rows, cols].tolist(), self.tile_types[rows, cols].tolist())
+
+    def bounds(self):
+        """Borde derecho e inferior en pixeles del ultimo tile, o None si no hay tiles"""
+        if self.max_col < 0:
+            return None
+        return ((self.max_col + 1) * TILE_SIZE, (self.max_row + 1) * TILE_SIZE)
+
+
+def load_level(source_path, custom_tiles):
+    """
+    Abre el binario cacheado de source_path, recompilandolo si el fuente cambio.
+    Si el binario no se puede escribir, se usa compilado en memoria.
+    """
+    stat = os.stat(source_path)
+    target = compiled_path(source_path)
+
+    compiled = None
+    if os.path.exists(target):
+        try:
+            compiled = CompiledLevel.open(target)
+        except (OSError, ValueError, struct.error):
+            compiled = None
+
+    if compiled is not None:
+        if compiled.matches(stat, custom_tiles):
+            return compiled
+        if compiled.signature == tiles_signature(custom_tiles) and compiled.source_size == stat.st_size:
+            # El mtime cambio (checkout, copia...) pero puede que el contenido no
+            with open(source_path, 'rb') as f:
+                if hashlib.sha256(f.read()).digest() == compiled.source_hash:
+                    return compiled
+
+    with open(source_path, 'rb') as f:
+        source_bytes = f.read()
+    data = compile_source(source_bytes, custom_tiles, stat.st_mtime_ns)
+
+    try:
+        temp_path = f"{target}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        compiled = None
+        os.replace(temp_path, target)
+        return CompiledLevel.open(target)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return CompiledLevel(data)
+
+
+def load_custom_tiles():
+    if os.path.exists("tile_map.json"):
+        with open("tile_map.json", "r") as f:
+            return json.load(f)
+    return {}
+
+
+def main():
+    sources = sys.argv[1:] or sorted(glob.glob("levels/*.txt"))
+    custom_tiles = load_custom_tiles()
+
+    for source in sources:
+        compiled = load_level(source, custom_tiles)
+        print(f"✓ {compiled_path(source)}: {compiled.cols}x{compiled.rows}, "
+              f"{np.count_nonzero(compiled.tiles)} tiles, {len(compiled.entities)} entidades")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,9 @@ import sys
 import os
 import json
 from config import *
+from autotile import AUTOTILE_TYPES, classify_cells, update_around
+from level_compiler import tile_chars
+from editor_grid import EditorGrid
 
 EDITOR_WIDTH = 1200
 EDITOR_HEIGHT = 700
@@ -13,12 +16,16 @@ SCROLL_SPEED = 15
 SIDEBAR_WIDTH = 300
 TOPBAR_HEIGHT = 50
 
+# Zona del mapa que no tapan la barra lateral ni la superior
+MAP_VIEW = pygame.Rect(SIDEBAR_WIDTH, TOPBAR_HEIGHT, EDITOR_WIDTH - SIDEBAR_WIDTH, EDITOR_HEIGHT - TOPBAR_HEIGHT)
+
 class LevelEditor:
     def __init__(self):
         self.screen = pygame.display.set_mode((EDITOR_WIDTH, EDITOR_HEIGHT), pygame.RESIZABLE)
         pygame.display.set_caption("Editor de Niveles - MODO EDICION")
         self.clock = pygame.time.Clock()
         
+        pygame.font.init()
         self.font = pygame.font.SysFont("Arial", 20, bold=True)
         self.small_font = pygame.font.SysFont("Arial", 14)
         self.header_font = pygame.font.SysFont("Arial", 22, bold=True)
@@ -57,7 +64,21 @@ class LevelEditor:
         self.scroll_y = -TOPBAR_HEIGHT - 50
         
         self.current_tile = '#' 
-        self.grid = {}
+        self.grid = EditorGrid()
+        self.autotile_types = {}
+        
+        # Canvas del mapa: se desplaza al hacer scroll y solo se redibujan las celdas sucias
+        self.canvas_cells = (MAP_VIEW.width // TILE_SIZE + 2, MAP_VIEW.height // TILE_SIZE + 2)
+        self.canvas = pygame.Surface((self.canvas_cells[0] * TILE_SIZE, self.canvas_cells[1] * TILE_SIZE))
+        self.canvas_origin = None
+        self.dirty_cells = set()
+        self.empty_canvas = self.canvas.copy()
+        for col in range(self.canvas_cells[0]):
+            for row in range(self.canvas_cells[1]):
+                rect = pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+                pygame.draw.rect(self.empty_canvas, (20, 20, 20), rect)
+                pygame.draw.rect(self.empty_canvas, (30, 30, 30), rect, 1)
+        self.ghosts = {}
         
         self.show_dropdown = False
         self.dropdown_scroll_offset = 0  
@@ -178,6 +199,9 @@ class LevelEditor:
             if texture:
                 self.tile_textures[char] = texture
         
+        # Mismos caracteres solidos que el juego, para que el autotile coincida
+        self.solid_chars = {chr(code) for code in tile_chars(self.tile_map)}
+        
         if self.active_custom_char is None and self.custom_tiles_list:
             self.active_custom_char = self.custom_tiles_list[0]['char']
         elif self.active_custom_char is None and 'T' in self.tile_map:
@@ -198,68 +222,112 @@ class LevelEditor:
             self.tile_map[new_char] = {"row": row, "col": col, "name": f"Custom {new_char}"}
             self.save_tile_map()
             self.update_custom_tiles_list()
+            self.classify_autotiles()
+            self.invalidate_canvas()
             self.active_custom_char = new_char
             self.current_tile = new_char
 
-    def draw_grid(self):
-        start_col = int(self.scroll_x // TILE_SIZE) - 1
-        end_col = start_col + (EDITOR_WIDTH // TILE_SIZE) + 4
-        start_row = int(self.scroll_y // TILE_SIZE) - 1
-        end_row = start_row + (EDITOR_HEIGHT // TILE_SIZE) + 4
+    def invalidate_canvas(self):
+        self.canvas_origin = None
+        self.dirty_cells.clear()
+
+    def invalidate_cell(self, col, row):
+        # La celda y sus vecinos, porque su autotile puede haber cambiado
+        self.dirty_cells.update(((col, row), (col, row - 1), (col, row + 1), (col - 1, row), (col + 1, row)))
+
+    def draw_cell(self, col, row):
+        origin_col, origin_row = self.canvas_origin
+        x = (col - origin_col) * TILE_SIZE
+        y = (row - origin_row) * TILE_SIZE
         
-        for col in range(start_col, end_col):
-            for row in range(start_row, end_row):
-                x = col * TILE_SIZE - self.scroll_x
-                y = row * TILE_SIZE - self.scroll_y
-                
-                if x < SIDEBAR_WIDTH - TILE_SIZE or y < TOPBAR_HEIGHT - TILE_SIZE or x > EDITOR_WIDTH or y > EDITOR_HEIGHT:
-                    continue
-                
-                rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-                pygame.draw.rect(self.screen, (20, 20, 20), rect)
-                pygame.draw.rect(self.screen, (30, 30, 30), rect, 1)
+        rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
+        pygame.draw.rect(self.canvas, (20, 20, 20), rect)
+        pygame.draw.rect(self.canvas, (30, 30, 30), rect, 1)
+        
+        char = self.grid.get((col, row))
+        if char is None:
+            return
+        
+        if char == '#':
+            key = AUTOTILE_TYPES[self.autotile_types.get((col, row), 0)]
+            
+            if key in self.autotiles:
+                self.canvas.blit(self.autotiles[key], rect)
+            else:
+                self.canvas.blit(self.autotiles['center'], rect)
                 
-                if (col, row) in self.grid:
-                    char = self.grid[(col, row)]
-                    
-                    if char == '#':
-                        has_top = self.grid.get((col, row - 1)) == '#'
-                        has_bottom = self.grid.get((col, row + 1)) == '#'
-                        has_left = self.grid.get((col - 1, row)) == '#'
-                        has_right = self.grid.get((col + 1, row)) == '#'
-                        
-                        key = 'center'
-                        if not has_top and not has_left: key = 'top_left'
-                        elif not has_top and not has_right: key = 'top_right'
-                        elif not has_bottom and not has_left: key = 'bottom_left'
-                        elif not has_bottom and not has_right: key = 'bottom_right'
-                        elif not has_top: key = 'top'
-                        elif not has_bottom: key = 'bottom'
-                        elif not has_left: key = 'left'
-                        elif not has_right: key = 'right'
-                        else: key = 'center'
-                        
-                        if key in self.autotiles:
-                            self.screen.blit(self.autotiles[key], rect)
-                        else:
-                            self.screen.blit(self.autotiles['center'], rect)
-                            
-                    elif char in self.monsters_textures and self.monsters_textures[char]:
-                        self.screen.blit(self.monsters_textures[char], rect)
-                        pygame.draw.rect(self.screen, (0,0,0), (x, y, 15, 15))
-                        self.screen.blit(self.small_font.render(char, True, (255,255,255)), (x+3, y))
-                    
-                    elif char in self.tile_textures and self.tile_textures[char]:
-                        self.screen.blit(self.tile_textures[char], rect)
-                    
-                    else:
-                        color = (150, 150, 150)
-                        for m in self.palette_monsters: 
-                            if m['char'] == char: color = m['color']
-                        for o in self.palette_objects:
-                            if o['char'] == char: color = o['color']
-                        pygame.draw.rect(self.screen, color, rect)
-                        self.screen.blit(self.font.render(char, True, (0,0,0)), (x+20, y+20))
+        elif char in self.monsters_textures and self.monsters_textures[char]:
+            self.canvas.blit(self.monsters_textures[char], rect)
+            pygame.draw.rect(self.canvas, (0,0,0), (x, y, 15, 15))
+            self.canvas.blit(self.small_font.render(char, True, (255,255,255)), (x+3, y))
+        
+        elif char in self.tile_textures and self.tile_textures[char]:
+            self.canvas.blit(self.tile_textures[char], rect)
+        
+        else:
+            color = (150, 150, 150)
+            for m in self.palette_monsters: 
+                if m['char'] == char: color = m['color']
+            for o in self.palette_objects:
+                if o['char'] == char: color = o['color']
+            pygame.draw.rect(self.canvas, color, rect)
+            self.canvas.blit(self.font.render(char, True, (0,0,0)), (x+20, y+20))
+
+    def redraw_cells(self, cols, rows):
+        # Fondo de celdas vacias de una vez y luego solo las celdas ocupadas de esos chunks
+        origin_col, origin_row = self.canvas_origin
+        area = pygame.Rect((cols.start - origin_col) * TILE_SIZE, (rows.start - origin_row) * TILE_SIZE,
+                           len(cols) * TILE_SIZE, len(rows) * TILE_SIZE)
+        self.canvas.blit(self.empty_canvas, area, area)
+        for (col, row), char in self.grid.cells_in(cols.start, rows.start, cols.stop, rows.stop):
+            self.draw_cell(col, row)
+
+    def update_canvas(self):
+        # El canvas esta alineado a la rejilla (una celda de margen), asi ninguna celda
+        # queda cortada por su borde y el scroll solo lo desplaza en celdas enteras
+        left = int(self.scroll_x) + MAP_VIEW.x
+        top = int(self.scroll_y) + MAP_VIEW.y
+        origin = (left // TILE_SIZE, top // TILE_SIZE)
+        cols, rows = self.canvas_cells
+        
+        if self.canvas_origin is None or abs(origin[0] - self.canvas_origin[0]) >= cols \
+                or abs(origin[1] - self.canvas_origin[1]) >= rows:
+            self.canvas_origin = origin
+            self.dirty_cells.clear()
+            self.redraw_cells(range(origin[0], origin[0] + cols), range(origin[1], origin[1] + rows))
+        
+        elif origin != self.canvas_origin:
+            dc = origin[0] - self.canvas_origin[0]
+            dr = origin[1] - self.canvas_origin[1]
+            self.canvas.scroll(-dc * TILE_SIZE, -dr * TILE_SIZE)
+            self.canvas_origin = origin
+            
+            all_cols = range(origin[0], origin[0] + cols)
+            all_rows = range(origin[1], origin[1] + rows)
+            if dc > 0: self.redraw_cells(all_cols[-dc:], all_rows)
+            elif dc < 0: self.redraw_cells(all_cols[:-dc], all_rows)
+            if dr > 0: self.redraw_cells(all_cols, all_rows[-dr:])
+            elif dr < 0: self.redraw_cells(all_cols, all_rows[:-dr])
+        
+        if self.dirty_cells:
+            for col, row in self.dirty_cells:
+                if 0 <= col - origin[0] < cols and 0 <= row - origin[1] < rows:
+                    self.draw_cell(col, row)
+            self.dirty_cells.clear()
+        
+        return pygame.Rect(left - origin[0] * TILE_SIZE, top - origin[1] * TILE_SIZE, MAP_VIEW.width, MAP_VIEW.height)
+
+    def ghost_for(self, tex):
+        ghost = self.ghosts.get(tex)
+        if ghost is None:
+            ghost = tex.copy()
+            ghost.set_alpha(150)
+            self.ghosts[tex] = ghost
+        return ghost
+
+    def draw_grid(self):
+        area = self.update_canvas()
+        self.screen.blit(self.canvas, MAP_VIEW.topleft, area)
 
         if not self.show_dropdown and not self.show_file_menu:
             mx, my = pygame.mouse.get_pos()
@@ -281,9 +349,7 @@ class LevelEditor:
                         tex = self.tile_textures[self.current_tile]
                     
                     if tex:
-                        ghost = tex.copy()
-                        ghost.set_alpha(150)
-                        self.screen.blit(ghost, (x, y))
+                        self.screen.blit(self.ghost_for(tex), (x, y))
                     else:
                         self.screen.blit(self.font.render(self.current_tile, True, (255,255,255)), (x+25, y+20))
                 else:
@@ -586,7 +652,7 @@ class LevelEditor:
             pass
 
     def load_level(self, filename):
-        self.grid = {}
+        self.grid = EditorGrid()
         if os.path.exists(filename):
             try:
                 with open(filename, 'r') as f:
@@ -595,17 +661,15 @@ class LevelEditor:
                             if char != ' ': self.grid[(c, r)] = char
                 self.current_file = filename
             except: pass
+        self.classify_autotiles()
+        self.invalidate_canvas()
 
     def save_level(self, filename):
         if not self.grid: return
         try:
             os.makedirs("levels", exist_ok=True)
-            max_c = max((k[0] for k in self.grid), default=0)
-            max_r = max((k[1] for k in self.grid), default=0)
             with open(filename, 'w') as f:
-                for r in range(max_r + 1):
-                    line = "".join(self.grid.get((c, r), ' ') for c in range(max_c + 1))
-                    f.write(line.rstrip() + '\n')
+                self.grid.write(f)
             self.update_level_order(filename)
         except: pass
 
@@ -626,16 +690,30 @@ class LevelEditor:
             if pygame.mouse.get_pressed()[2]:
                 if pygame.mouse.get_pos()[0] > SIDEBAR_WIDTH: self.delete_tile(pygame.mouse.get_pos())
 
+    def is_solid(self, cell):
+        return self.grid.get(cell) in self.solid_chars
+
+    def classify_autotiles(self):
+        self.autotile_types = classify_cells([cell for cell, char in self.grid.items() if char in self.solid_chars])
+
     def paint_tile(self, pos):
         c = int((pos[0] + self.scroll_x) // TILE_SIZE)
         r = int((pos[1] + self.scroll_y) // TILE_SIZE)
-        if self.current_tile: self.grid[(c, r)] = self.current_tile
+        if self.current_tile:
+            if self.grid.get((c, r)) == self.current_tile: return
+            self.grid[(c, r)] = self.current_tile
         elif (c,r) in self.grid: del self.grid[(c,r)]
+        else: return
+        update_around(self.autotile_types, self.is_solid, c, r)
+        self.invalidate_cell(c, r)
 
     def delete_tile(self, pos):
         c = int((pos[0] + self.scroll_x) // TILE_SIZE)
         r = int((pos[1] + self.scroll_y) // TILE_SIZE)
-        if (c,r) in self.grid: del self.grid[(c,r)]
+        if (c,r) in self.grid:
+            del self.grid[(c,r)]
+            update_around(self.autotile_types, self.is_solid, c, r)
+            self.invalidate_cell(c, r)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -650,7 +728,7 @@ class LevelEditor:
         elif event.type == pygame.KEYDOWN:
             if self.typing_new_file:
                 if event.key == pygame.K_RETURN: 
-                    if self.new_file_name: self.current_file = f"levels/{self.new_file_name}.txt"; self.grid={}; self.save_level(self.current_file); self.mode="editor"; self.typing_new_file=False
+                    if self.new_file_name: self.current_file = f"levels/{self.new_file_name}.txt"; self.grid=EditorGrid(); self.autotile_types={}; self.invalidate_canvas(); self.save_level(self.current_file); self.mode="editor"; self.typing_new_file=False
                 elif event.key == pygame.K_BACKSPACE: self.new_file_name = self.new_file_name[:-1]
                 elif event.key == pygame.K_ESCAPE: self.typing_new_file = False
                 else: self.new_file_name += event.unicode
@@ -0,0 +1,188 @@
+import random
+import numpy as np
+import pygame
+from config import TILE_SIZE, WIDTH, HEIGHT, STREAM_RADIUS
+
+CHUNK_TILES = 16
+CHUNK_SIZE = CHUNK_TILES * TILE_SIZE
+
+
+class LevelStreamer:
+    """
+    Activa por chunks (los mismos CHUNK_TILES x CHUNK_TILES del horneado) la parte del
+    nivel cercana a la camara: tiles y colision a STREAM_RADIUS chunks de la vista, y
+    monstruos un chunk mas adentro, para que nunca pisen un chunk sin tiles.
+
+    Los chunks lejanos quedan solo en el nivel compilado (tiles), en tuplas
+    (decoraciones) y en el estado compacto de sus monstruos.
+    """
+
+    def __init__(self, level, compiled):
+        self.level = level
+        self.compiled = compiled
+        self.chunk_cols = -(-compiled.cols // CHUNK_TILES)
+        self.chunk_rows = -(-compiled.rows // CHUNK_TILES)
+
+        self.active = set()
+        self.active_range = None
+        self.monster_area = None
+        self.chunk_tiles = {}
+        self.decorations = {}
+        self.suspended = {}
+
+        level.back_chunks = {}
+        level.front_chunks = {}
+        level._premultiplied = {}
+
+    def solid_grid(self):
+        """Rejilla [fila, columna] de celdas solidas de todo el nivel"""
+        return self.compiled.tiles != 0
+
+    def place_decorations(self):
+        # Mismas llamadas a random y en el mismo orden que Level.place_decorations,
+        # pero guardando (imagen, x, y) en cada chunk que toca la decoracion
+        decorations = self.level.decorations
+        if not decorations:
+            return
+
+        tiles = self.compiled.tiles
+        last_row = tiles.shape[0] - 1
+        cols, rows, _, _ = self.compiled.tile_positions()
+        for col, row in zip(cols, rows):
+            if row == last_row or not tiles[row + 1, col]:
+                if random.random() < 0.3:
+                    x = col * TILE_SIZE + random.randint(0, TILE_SIZE - 48)
+                    y = (row + 1) * TILE_SIZE - 10
+                    image = random.choice(decorations)
+                    index = decorations.index(image)
+
+                    w, h = image.get_size()
+                    for cx in range(x // CHUNK_SIZE, (x + w - 1) // CHUNK_SIZE + 1):
+                        for cy in range(y // CHUNK_SIZE, (y + h - 1) // CHUNK_SIZE + 1):
+                            self.decorations.setdefault((cx, cy), []).append((index, x, y))
+
+    def chunk_range(self, view, radius):
+        """(cx0, cy0, cx1, cy1) inclusivo de los chunks a radius chunks de view"""
+        return (max(0, view.left // CHUNK_SIZE - radius),
+                max(0, view.top // CHUNK_SIZE - radius),
+                min(self.chunk_cols - 1, (view.right - 1) // CHUNK_SIZE + radius),
+                min(self.chunk_rows - 1, (view.bottom - 1) // CHUNK_SIZE + radius))
+
+    def update(self, view):
+        active_range = self.chunk_range(view, STREAM_RADIUS)
+        if active_range != self.active_range:
+            self.active_range = active_range
+            cx0, cy0, cx1, cy1 = active_range
+            wanted = {(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)}
+            for key in self.active - wanted:
+                self.suspend_chunk(key)
+            for key in sorted(wanted - self.active):
+                self.activate_chunk(key)
+            self.active = wanted
+
+        area = self.chunk_range(view, STREAM_RADIUS - 1)
+        if area != self.monster_area:
+            self.monster_area = area
+            for key in sorted(self.suspended):
+                if self.in_monster_area(key):
+                    self.restore_monsters(key)
+
+        self.suspend_stray_monsters()
+
+    def spawn_view(self):
+        x, y = self.level.player_spawn
+        return pygame.Rect(x - WIDTH // 2, y - HEIGHT // 2, WIDTH, HEIGHT)
+
+    def in_monster_area(self, key):
+        cx0, cy0, cx1, cy1 = self.monster_area
+        return cx0 <= key[0] <= cx1 and cy0 <= key[1] <= cy1
+
+    def activate_chunk(self, key):
+        level = self.level
+        cx, cy = key
+        col0 = cx * CHUNK_TILES
+        row0 = cy * CHUNK_TILES
+        tiles = self.compiled.tiles[row0:row0 + CHUNK_TILES, col0:col0 + CHUNK_TILES]
+        types = self.compiled.tile_types[row0:row0 + CHUNK_TILES, col0:col0 + CHUNK_TILES]
+
+        rows, cols = np.nonzero(tiles)
+        platforms = []
+        for col, row, code, type_index in zip(cols.tolist(), rows.tolist(),
+                                              tiles[rows, cols].tolist(), types[rows, cols].tolist()):
+            platform = level.make_platform(col0 + col, row0 + row, code, type_index)
+            level.platform_grid[platform['grid_pos']] = platform
+            level.bake_tile(platform)
+            platforms.append(platform)
+        self.chunk_tiles[key] = platforms
+
+        for index, x, y in self.decorations.get(key, ()):
+            level.bake_image(level.front_chunks, level.decorations[index], (x, y), only=key)
+
+    def suspend_chunk(self, key):
+        level = self.level
+        for platform in self.chunk_tiles.pop(key, ()):
+            del level.platform_grid[platform['grid_pos']]
+        level.back_chunks.pop(key, None)
+        level.front_chunks.pop(key, None)
+
+    def chunk_of(self, x, y):
+        # Acotado a la rejilla de chunks como monster_area: un monstruo fuera del nivel
+        # (encima de la fila 0, pasada la ultima columna...) se guarda en el chunk del borde
+        return (min(max(x // CHUNK_SIZE, 0), self.chunk_cols - 1),
+                min(max(y // CHUNK_SIZE, 0), self.chunk_rows - 1))
+
+    def suspend_stray_monsters(self):
+        level = self.level
+        cx0, cy0, cx1, cy1 = self.monster_area
+
+        if level.monster_system is not None:
+            system = level.monster_system
+            n = system.count
+            if n == 0:
+                return
+            from monster_system import MONSTER_SIZE
+            cx = np.clip((system.rect_x[:n] + MONSTER_SIZE // 2) // CHUNK_SIZE, 0, self.chunk_cols - 1)
+            cy = np.clip((system.rect_y[:n] + MONSTER_SIZE // 2) // CHUNK_SIZE, 0, self.chunk_rows - 1)
+            outside = (cx < cx0) | (cx > cx1) | (cy < cy0) | (cy > cy1)
+            if not outside.any():
+                return
+
+            cx = cx[outside]
+            cy = cy[outside]
+            rows = system.extract(outside)
+            for key in set(zip(cx.tolist(), cy.tolist())):
+                mask = (cx == key[0]) & (cy == key[1])
+                self.suspended.setdefault(key, []).append(
+                    {name: values[mask] for name, values in rows.items()})
+            return
+
+        kept = 0
+        monsters = level.monsters
+        for monster in monsters:
+            key = self.chunk_of(monster.rect.centerx, monster.rect.centery)
+            if cx0 <= key[0] <= cx1 and cy0 <= key[1] <= cy1:
+                monsters[kept] = monster
+                kept += 1
+            else:
+                self.suspended.setdefault(key, []).append(monster.suspend())
+        if kept != len(monsters):
+            del monsters[kept:]
+            level.monster_hash_dirty = True
+
+    def restore_monsters(self, key):
+        level = self.level
+        from monster import Monster
+
+        for state in self.suspended.pop(key):
+            if level.monster_system is not None:
+                level.monster_system.insert(state)
+            else:
+                level.monsters.append(Monster.restore(state))
+        level.monster_hash_dirty = True
+
+    def suspended_count(self):
+        total = 0
+        for states in self.suspended.values():
+            for state in states:
+                total += len(state["x"]) if isinstance(state, dict) else 1
+        return total
@@ -1,39 +1,172 @@
+import os
+import json
+import hashlib
+import pygame
 from player import Player
 from projectile import Fireball
 
+LAYERS = [
+    "BODY_male.png",
+    "LEGS_robe_skirt.png",
+    "TORSO_robe_shirt_brown.png",
+    "HEAD_robe_hood.png",
+    "BELT_rope.png",
+]
+
+ANIMATION_FOLDERS = {
+    "walk": "walkcycle",
+    "spell": "spellcast",
+    "hurt": "hurt"
+}
+
+BAKED_DIR = "assets/images/player/baked"
+BAKED_MANIFEST = f"{BAKED_DIR}/manifest.json"
+
+COLOR_VARIANTS = {
+    "normal": "assets/images/player/Mage",
+    "black": "assets/images/player/Mage_Black",
+    "blue": "assets/images/player/Mage_Blue",
+    "red": "assets/images/player/Mage_Red",
+    "background": "assets/images/player/Mage_Background"
+}
+
+def layer_sources(base_path):
+    """Rutas de las capas que se componen para base_path, en orden de carpeta y capa"""
+    return [f"{base_path}/{folder}/{layer}" for folder in ANIMATION_FOLDERS.values() for layer in LAYERS]
+
+
+def source_stamp(path):
+    """mtime, tamano y sha256 de una capa (None si no existe), para detectar atlas desactualizados"""
+    try:
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
+
+
+def sources_match(stamps):
+    # Igual que level_compiler: mtime y tamano bastan; si solo cambio el mtime
+    # (checkout, copia...) se compara el hash del contenido
+    if not stamps:
+        return False
+    for path, stamp in stamps.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            if stamp is not None:
+                return False
+            continue
+        if stamp is None or stat.st_size != stamp["size"]:
+            return False
+        if stat.st_mtime_ns == stamp["mtime_ns"]:
+            continue
+        with open(path, 'rb') as f:
+            if hashlib.sha256(f.read()).hexdigest() != stamp["sha256"]:
+                return False
+    return True
+
+
 class Mage(Player):
+    # Hojas ya compuestas por carpeta de color, compartidas por todas las instancias
+    _sprite_sets = {}
+    _baked_manifest = None
+    
     def __init__(self, x, y):
-        super().__init__(x, y, "mage", "assets/images/player/mage")
+        super().__init__(x, y, "mage", COLOR_VARIANTS["normal"])
         self.cast_cooldown = 0
         self.pending_projectile = None
         self.load_sprites()
     
+    @classmethod
+    def preload_variants(cls):
+        for base_path in COLOR_VARIANTS.values():
+            cls.preload_variant(base_path)
+    
+    @classmethod
+    def preload_variant(cls, base_path):
+        if base_path not in cls._sprite_sets:
+            try:
+                cls._sprite_sets[base_path] = cls._build_sprite_set(base_path)
+            except Exception:
+                pass
+    
+    def set_color(self, color):
+        self.base_path = COLOR_VARIANTS[color]
+        self.load_sprites()
+    
     def load_sprites(self):
-        layers = [
-            "BODY_male.png",
-            "LEGS_robe_skirt.png",
-            "TORSO_robe_shirt_brown.png",
-            "HEAD_robe_hood.png",
-            "BELT_rope.png",
-        ]
-        
-        self.animations = {
-            "walk": self._combine_layers(layers, "walkcycle"),
-            "spell": self._combine_layers(layers, "spellcast"),
-            "hurt": self._combine_layers(layers, "hurt")
-        }
+        sprite_set = Mage._sprite_sets.get(self.base_path)
+        if sprite_set is None:
+            sprite_set = self._build_sprite_set(self.base_path)
+            Mage._sprite_sets[self.base_path] = sprite_set
+        
+        self.animations, self.frame_counts = sprite_set
+    
+    @classmethod
+    def _build_sprite_set(cls, base_path):
+        animations = cls._load_baked_atlas(base_path)
+        if animations is None:
+            animations = cls.composite_animations(base_path)
+        
+        if pygame.display.get_surface() is not None:
+            animations = {name: sheet.convert_alpha() for name, sheet in animations.items()}
         
-        self.frame_counts = {
-            "walk": self.animations["walk"].get_width() // 64,
-            "spell": self.animations["spell"].get_width() // 64,
-            "hurt": self.animations["hurt"].get_width() // 64
+        frame_counts = {name: sheet.get_width() // 64 for name, sheet in animations.items()}
+        
+        return animations, frame_counts
+    
+    @staticmethod
+    def composite_animations(base_path):
+        return {
+            name: Player.combine_layers(base_path, LAYERS, folder)
+            for name, folder in ANIMATION_FOLDERS.items()
         }
     
-    def update(self, keys, platforms):
+    @classmethod
+    def _load_baked_atlas(cls, base_path):
+        # Atlas pre-compuesto por bake_sprites.py; si falta o no coincide se compone en vivo
+        if cls._baked_manifest is None:
+            cls._baked_manifest = {}
+            if os.path.exists(BAKED_MANIFEST):
+                try:
+                    with open(BAKED_MANIFEST, "r") as f:
+                        cls._baked_manifest = json.load(f)
+                except Exception:
+                    pass
+        
+        if cls._baked_manifest.get("layers") != LAYERS:
+            return None
+        
+        for variant in cls._baked_manifest.get("variants", {}).values():
+            if variant.get("source") != base_path:
+                continue
+            sources = variant.get("sources") or {}
+            if set(sources) != set(layer_sources(base_path)) or not sources_match(sources):
+                # Alguna capa cambio (o recolor_mage.py volvio a correr): el atlas esta viejo
+                print(f"⚠️  Atlas de {base_path} desactualizado, se compone en vivo (python bake_sprites.py)")
+                return None
+            try:
+                atlas = pygame.image.load(f"{BAKED_DIR}/{variant['atlas']}")
+                animations = {}
+                for name, entry in variant["animations"].items():
+                    animations[name] = atlas.subsurface(
+                        pygame.Rect(entry["x"], entry["y"], entry["width"], entry["height"])
+                    )
+                if set(animations) != set(ANIMATION_FOLDERS):
+                    return None
+                return animations
+            except Exception:
+                return None
+        
+        return None
+    
+    def update(self, keys, level):
         if self.cast_cooldown > 0:
             self.cast_cooldown -= 1
         
-        super().update(keys, platforms)
+        super().update(keys, level)
         
         if self.is_casting and self.current_frame == 3 and self.pending_projectile:
             proj = self.pending_projectile
@@ -52,11 +185,13 @@ class Mage(Player):
             
             spawn_x = self.rect.centerx
             spawn_y = self.rect.centery
-            self.pending_projectile = Fireball(spawn_x, spawn_y, self.direction)
+            self.pending_projectile = Fireball.spawn(spawn_x, spawn_y, self.direction)
             
             return True
         
         return False
     
     def on_spell_complete(self):
+        if self.pending_projectile:
+            self.pending_projectile.release()
         self.pending_projectile = None
\ No newline at end of file
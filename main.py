@@ -1,16 +1,34 @@
+import startup_profile
 import pygame
+startup_profile.mark("import pygame")
 import json
 import os
+import time
 from config import *
-from mage import Mage
-from level import Level
+startup_profile.mark("config (display.init)")
 from camera import Camera
+from perf_hud import PerfHUD
+from text_cache import get_font, render_text
+from gradients import vertical_gradient, MENU_PALETTE
+from retained_frame import RetainedFrame
+# Level y Mage (tileset, sprites, NumPy del nivel) se importan al elegir nivel
+startup_profile.mark("modulos del menu")
+
+MENU_TITLE = "Run to the goal"
 
 class Game:
-    def __init__(self):
-        pygame.init()
-        
-        if DISPLAY_MODE == "fullscreen":
+    def __init__(self, headless=HEADLESS, input_source=None):
+        # En vez de pygame.init(): sin audio ni joystick, que el juego no usa.
+        # pygame.time.wait inicia el temporizador de SDL que necesita get_ticks
+        pygame.display.init()
+        pygame.time.wait(0)
+        
+        self.headless = headless
+        self.input_source = input_source
+        
+        if headless:
+            self.screen = pygame.Surface((WIDTH, HEIGHT))
+        elif DISPLAY_MODE == "fullscreen":
             self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
         elif DISPLAY_MODE == "borderless":
             self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.NOFRAME)
@@ -20,8 +38,10 @@ class Game:
             else:
                 self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         
-        pygame.display.set_caption("Mi Juego de Puzzle")
+        if not headless:
+            pygame.display.set_caption("Mi Juego de Puzzle")
         self.clock = pygame.time.Clock()
+        startup_profile.mark("ventana")
         
         self.width = WIDTH
         self.height = HEIGHT
@@ -45,14 +65,11 @@ class Game:
         self.level_message_timer = 0
         
         self.lives = 3
-        try:
-            self.life_icon = pygame.image.load("images/vida.png").convert_alpha()
-            self.life_icon = pygame.transform.scale(self.life_icon, (32, 32))
-        except:
-            self.life_icon = None
+        self.life_icon = None
+        self.life_icon_loaded = False
             
-        self.menu_font_title = pygame.font.Font(None, 120)
-        self.menu_font_button = pygame.font.Font(None, 60)
+        self.menu_font_title = get_font(120)
+        self.menu_font_button = get_font(60)
         self.play_button_rect = pygame.Rect(0, 0, 300, 80)
         self.levels_button_rect = pygame.Rect(0, 0, 300, 60)
         self.editor_button_rect = pygame.Rect(0, 0, 300, 60)
@@ -65,10 +82,47 @@ class Game:
 
         self.pause_overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         self.pause_overlay.fill((0, 0, 0, 150))
+        self.menu_backdrop = None
+        self.menu_subtitle = None
+        
+        # Menus y pausa en modo retenido: capa estatica + regiones sucias
+        self.menu_frame = RetainedFrame()
+        self.selection_frame = RetainedFrame()
+        self.pause_frame = RetainedFrame()
+        self.presented_frame = None
+        self.last_input = time.perf_counter()
         
         self.btn_resume = pygame.Rect(0, 0, 200, 50)
         self.btn_restart = pygame.Rect(0, 0, 200, 50)
         self.btn_menu = pygame.Rect(0, 0, 200, 50)
+        
+        self.perf = PerfHUD()
+        self.assets_preloaded = False
+        self.preload = None
+        self.level_loaded = False
+        startup_profile.mark("fuentes y estado del menu")
+    
+    def get_life_icon(self):
+        # Solo lo usa el nivel 3: se carga la primera vez que se dibuja
+        if not self.life_icon_loaded:
+            self.life_icon_loaded = True
+            try:
+                self.life_icon = pygame.image.load("images/vida.png").convert_alpha()
+                self.life_icon = pygame.transform.scale(self.life_icon, (32, 32))
+            except:
+                self.life_icon = None
+        return self.life_icon
+    
+    def preload_steps(self):
+        # Con el menu inactivo se adelanta lo pesado, para que elegir nivel no lo pague.
+        # Cada paso es corto: wait_for_input ejecuta uno por frame
+        from level import Level
+        from mage import Mage, COLOR_VARIANTS
+        yield
+        yield from Level.preload_steps()
+        for base_path in COLOR_VARIANTS.values():
+            Mage.preload_variant(base_path)
+            yield
     
     def load_level_order(self):
         if os.path.exists("level_order.json"):
@@ -82,6 +136,11 @@ class Game:
     
     def load_level_by_index(self, index):
         if 0 <= index < len(self.level_order):
+            startup_profile.start()
+            from level import Level
+            from mage import Mage
+            startup_profile.mark("import level/mage")
+            
             level_file = self.level_order[index]
             self.current_level_index = index
             
@@ -91,19 +150,26 @@ class Game:
                 self.level.handle_resize(self.width, self.height)
             
             spawn_x, spawn_y = self.level.player_spawn
+            Mage.preload_variants()
             self.player = Mage(spawn_x, spawn_y)
             self.change_player_color(self.current_color)
+            startup_profile.mark("jugador")
             
+            for proj in self.projectiles:
+                proj.release()
             self.projectiles = []
             self.game_state = "playing"
             
             level_width, level_height = self.level.get_dimensions()
             self.camera = Camera(level_width, level_height)
+            self.camera.snap(self.player.rect)
+            self.level_loaded = True
             
             if "level3" in level_file and self.level.monster_spawns:
                 self.level.spawn_monsters()
                 self.level_message = "Busca la salida como un camaleon"
                 self.level_message_timer = 360
+            startup_profile.report(f"carga de {level_file}")
         else:
             self.game_state = "game_complete"
     
@@ -159,43 +225,16 @@ class Game:
                 "text": name,
                 "file": level_path
             })
+        self.selection_frame.invalidate()
 
     def change_player_color(self, color):
         if not self.player: return
+        from mage import COLOR_VARIANTS
+        if color not in COLOR_VARIANTS: return
         try:
-            color_paths = {
-                "normal": "assets/images/player/Mage",
-                "black": "assets/images/player/Mage_Black",
-                "blue": "assets/images/player/Mage_Blue",
-                "red": "assets/images/player/Mage_Red",
-                "background": "assets/images/player/Mage_Background"
-            }
-            
-            if color not in color_paths: return
-             
-            old_x = self.player.x
-            old_y = self.player.y
-            old_vel_x = self.player.vel_x
-            old_vel_y = self.player.vel_y
-            old_animation = self.player.current_animation
-            old_frame = self.player.current_frame
-            old_direction = self.player.direction
-            
-            self.player.base_path = color_paths[color]
-            self.player.load_sprites()
-            
-            self.player.x = old_x
-            self.player.y = old_y
-            self.player.rect.x = int(old_x)
-            self.player.rect.y = int(old_y)
-            self.player.vel_x = old_vel_x
-            self.player.vel_y = old_vel_y
-            self.player.current_animation = old_animation
-            self.player.current_frame = old_frame  
-            self.player.direction = old_direction
-            
+            # Las variantes ya estan compuestas en memoria: solo se cambia la referencia
+            self.player.set_color(color)
             self.current_color = color
-            
         except Exception:
             pass
 
@@ -211,37 +250,84 @@ class Game:
         if hasattr(self, 'width'):
             self.level.handle_resize(self.width, self.height)
     
-    def draw_menu(self):
-        for y in range(0, self.height, 4):
-            color_val = int(20 + (y / self.height) * 40)
-            pygame.draw.rect(self.screen, (color_val // 3, color_val // 3, color_val), 
-                           (0, y, self.width, 4))
-        
-        time = pygame.time.get_ticks()
-        pulse = abs((time % 1000) - 500) / 500.0
+    def build_menu_backdrop(self):
+        # Degradado y sombras del titulo: no cambian entre frames, se componen una vez por tamano
+        backdrop = vertical_gradient(self.width, self.height, MENU_PALETTE, band=4).copy()
         
         center_x = self.width // 2
         center_y = self.height // 3
         
-        title_text = "Run to the goal"
         for offset in range(5, 0, -1):
             shadow_color = (offset * 10, offset * 10, offset * 15)
-            shadow_surf = self.menu_font_title.render(title_text, True, shadow_color)
+            shadow_surf = render_text(self.menu_font_title, MENU_TITLE, shadow_color)
             shadow_rect = shadow_surf.get_rect(center=(center_x + offset, center_y + offset))
-            self.screen.blit(shadow_surf, shadow_rect)
+            backdrop.blit(shadow_surf, shadow_rect)
+        
+        return backdrop
+    
+    def build_menu_layer(self, is_hover_levels, is_hover_editor):
+        layer = self.menu_backdrop.copy()
+        
+        color_levels = (50, 100, 200) if is_hover_levels else (40, 80, 150)
+        pygame.draw.rect(layer, color_levels, self.levels_button_rect, border_radius=20)
+        pygame.draw.rect(layer, (150, 200, 255), self.levels_button_rect, 3, border_radius=20)
+        lvl_text = render_text(self.menu_font_button, "NIVELES", (255, 255, 255))
+        lvl_rect = lvl_text.get_rect(center=self.levels_button_rect.center)
+        layer.blit(lvl_text, lvl_rect)
+        
+        color_editor = (150, 50, 150) if is_hover_editor else (100, 30, 100)
+        pygame.draw.rect(layer, color_editor, self.editor_button_rect, border_radius=20)
+        pygame.draw.rect(layer, (200, 100, 255), self.editor_button_rect, 3, border_radius=20)
+        ed_text = render_text(self.menu_font_button, "EDITOR", (255, 255, 255))
+        ed_rect = ed_text.get_rect(center=self.editor_button_rect.center)
+        layer.blit(ed_text, ed_rect)
+        
+        return layer
+    
+    def show_frame(self, frame):
+        # Si otra pantalla dibujo encima, el frame se vuelve a presentar completo
+        if self.presented_frame is not frame:
+            frame.refresh()
+            self.presented_frame = frame
+    
+    def draw_menu(self):
+        if self.menu_backdrop is None or self.menu_backdrop.get_size() != (self.width, self.height):
+            self.menu_backdrop = self.build_menu_backdrop()
         
+        center_x = self.width // 2
+        center_y = self.height // 3
+        button_y = center_y + 150
+        levels_y = button_y + 110
+        editor_y = levels_y + 80
+        self.levels_button_rect.center = (center_x, levels_y)
+        self.editor_button_rect.center = (center_x, editor_y)
+        
+        mouse_pos = pygame.mouse.get_pos()
+        is_hover_levels = self.levels_button_rect.collidepoint(mouse_pos)
+        is_hover_editor = self.editor_button_rect.collidepoint(mouse_pos)
+        
+        # Los botones NIVELES y EDITOR solo cambian con el hover: van en la capa estatica
+        frame = self.menu_frame
+        self.show_frame(frame)
+        frame.prepare((self.width, self.height, is_hover_levels, is_hover_editor),
+                      lambda: self.build_menu_layer(is_hover_levels, is_hover_editor))
+        frame.begin(self.screen)
+        rects = []
+        
+        time = pygame.time.get_ticks()
+        pulse = abs((time % 1000) - 500) / 500.0
+        
+        title_text = MENU_TITLE
         title_color = (int(200 + pulse * 55), int(200 + pulse * 55), int(50 + pulse * 50))
-        title_surf = self.menu_font_title.render(title_text, True, title_color)
+        title_surf = render_text(self.menu_font_title, title_text, title_color)
         title_rect = title_surf.get_rect(center=(center_x, center_y))
-        self.screen.blit(title_surf, title_rect)
+        rects.append(self.screen.blit(title_surf, title_rect))
         
-        button_y = center_y + 150  
         button_width = 400
         button_height = 100
         self.play_button_rect = pygame.Rect(0, 0, button_width, button_height)
         self.play_button_rect.center = (center_x, button_y)
         
-        mouse_pos = pygame.mouse.get_pos()
         is_hover = self.play_button_rect.collidepoint(mouse_pos)
         button_pulse = 1.0 + (pulse * 0.1 if is_hover else pulse * 0.05)
         
@@ -255,134 +341,206 @@ class Game:
             glow_surf = pygame.Surface((glow_rect.width, glow_rect.height))
             glow_surf.set_alpha(80)
             glow_surf.fill((100, 255, 100))
-            self.screen.blit(glow_surf, glow_rect.topleft)
+            rects.append(self.screen.blit(glow_surf, glow_rect.topleft))
         
         button_color = (50, 220, 50) if is_hover else (40, 180, 40)
-        pygame.draw.rect(self.screen, button_color, pulsed_rect, border_radius=20)
+        rects.append(pygame.draw.rect(self.screen, button_color, pulsed_rect, border_radius=20))
         pygame.draw.rect(self.screen, (200, 255, 200), pulsed_rect, 5, border_radius=20)
         
-        button_font = pygame.font.Font(None, 80)
-        text_surf = button_font.render("JUGAR", True, (255, 255, 255))
+        button_font = get_font(80)
+        text_surf = render_text(button_font, "JUGAR", (255, 255, 255))
         text_rect = text_surf.get_rect(center=(center_x, button_y))
-        self.screen.blit(text_surf, text_rect)
+        rects.append(self.screen.blit(text_surf, text_rect))
         
-        levels_y = button_y + 110
-        self.levels_button_rect.center = (center_x, levels_y)
-        is_hover_levels = self.levels_button_rect.collidepoint(mouse_pos)
-        color_levels = (50, 100, 200) if is_hover_levels else (40, 80, 150)
-        pygame.draw.rect(self.screen, color_levels, self.levels_button_rect, border_radius=20)
-        pygame.draw.rect(self.screen, (150, 200, 255), self.levels_button_rect, 3, border_radius=20)
-        lvl_text = self.menu_font_button.render("NIVELES", True, (255, 255, 255))
-        lvl_rect = lvl_text.get_rect(center=self.levels_button_rect.center)
-        self.screen.blit(lvl_text, lvl_rect)
-
-        editor_y = levels_y + 80
-        self.editor_button_rect.center = (center_x, editor_y)
-        is_hover_editor = self.editor_button_rect.collidepoint(mouse_pos)
-        color_editor = (150, 50, 150) if is_hover_editor else (100, 30, 100)
-        pygame.draw.rect(self.screen, color_editor, self.editor_button_rect, border_radius=20)
-        pygame.draw.rect(self.screen, (200, 100, 255), self.editor_button_rect, 3, border_radius=20)
-        ed_text = self.menu_font_button.render("EDITOR", True, (255, 255, 255))
-        ed_rect = ed_text.get_rect(center=self.editor_button_rect.center)
-        self.screen.blit(ed_text, ed_rect)
-        
-        subtitle_font = pygame.font.Font(None, 30)
-        subtitle_text = "Click para comenzar la aventura"
+        if self.menu_subtitle is None:
+            # Copia propia: set_alpha no debe alterar la superficie compartida del cache de texto
+            subtitle_font = get_font(30)
+            subtitle_text = "Click para comenzar la aventura"
+            self.menu_subtitle = render_text(subtitle_font, subtitle_text, (200, 200, 200)).copy()
         subtitle_alpha = int(150 + pulse * 105)
-        subtitle_surf = subtitle_font.render(subtitle_text, True, (200, 200, 200))
+        subtitle_surf = self.menu_subtitle
         subtitle_surf.set_alpha(subtitle_alpha)
         subtitle_rect = subtitle_surf.get_rect(center=(center_x, self.height - 50))
-        self.screen.blit(subtitle_surf, subtitle_rect)
+        rects.append(self.screen.blit(subtitle_surf, subtitle_rect))
         
         for i in range(20):
             star_x = (i * 100 + time // 10) % self.width
             star_y = (i * 50 + time // 15) % self.height
             star_alpha = int((i % 3) * 85 + pulse * 85)
             if star_alpha > 30:
-                pygame.draw.circle(self.screen, (255, 255, 150), (star_x, star_y), 2)
+                rects.append(pygame.draw.circle(self.screen, (255, 255, 150), (star_x, star_y), 2))
         
-        pygame.display.flip()
+        frame.present(rects)
 
-    def draw_level_selection(self):
-        self.screen.fill((30, 30, 40))
+    def build_selection_layer(self):
+        layer = pygame.Surface((self.width, self.height))
+        layer.fill((30, 30, 40))
         
-        title = self.menu_font_button.render("SELECCIONA NIVEL", True, (255, 255, 255))
+        title = render_text(self.menu_font_button, "SELECCIONA NIVEL", (255, 255, 255))
         title_rect = title.get_rect(center=(self.width // 2, 60))
-        self.screen.blit(title, title_rect)
+        layer.blit(title, title_rect)
         
-        pygame.draw.rect(self.screen, (200, 50, 50), self.back_button_rect, border_radius=10)
-        back_text = pygame.font.Font(None, 30).render("Volver", True, (255, 255, 255))
+        pygame.draw.rect(layer, (200, 50, 50), self.back_button_rect, border_radius=10)
+        back_text = render_text(get_font(30), "Volver", (255, 255, 255))
         text_rect = back_text.get_rect(center=self.back_button_rect.center)
-        self.screen.blit(back_text, text_rect)
+        layer.blit(back_text, text_rect)
         
-        mouse_pos = pygame.mouse.get_pos()
-        font = pygame.font.Font(None, 40)
+        for btn in self.level_buttons:
+            self.draw_level_button(layer, btn, False)
+        return layer
+    
+    def draw_level_button(self, surface, btn, is_hover):
+        rect = btn["rect"]
+        color = (50, 200, 100) if is_hover else (70, 80, 100)
+        
+        pygame.draw.rect(surface, color, rect, border_radius=15)
+        pygame.draw.rect(surface, (255, 255, 255), rect, 2, border_radius=15)
+        
+        text = render_text(get_font(40), btn["text"], (255, 255, 255))
+        text_rect = text.get_rect(center=rect.center)
+        surface.blit(text, text_rect)
+        return rect
+
+    def draw_level_selection(self):
+        frame = self.selection_frame
+        self.show_frame(frame)
+        frame.prepare((self.width, self.height), self.build_selection_layer)
         
+        mouse_pos = pygame.mouse.get_pos()
+        hovered = None
         for btn in self.level_buttons:
-            rect = btn["rect"]
-            is_hover = rect.collidepoint(mouse_pos)
-            color = (50, 200, 100) if is_hover else (70, 80, 100)
-            
-            pygame.draw.rect(self.screen, color, rect, border_radius=15)
-            pygame.draw.rect(self.screen, (255, 255, 255), rect, 2, border_radius=15)
-            
-            text = font.render(btn["text"], True, (255, 255, 255))
-            text_rect = text.get_rect(center=rect.center)
-            self.screen.blit(text, text_rect)
+            if btn["rect"].collidepoint(mouse_pos):
+                hovered = btn
+        
+        # Solo el boton bajo el raton difiere de la capa; sin cambios no se dibuja nada
+        if not frame.changed(hovered["index"] if hovered else None):
+            return
+        frame.begin(self.screen)
+        rects = []
+        if hovered:
+            rects.append(self.draw_level_button(self.screen, hovered, True))
+        frame.present(rects)
 
-    def draw_pause_menu(self):
-        self.draw() 
+    def pause_buttons(self):
+        return [
+            (self.btn_resume, "Continuar", (50, 200, 50)),
+            (self.btn_restart, "Reiniciar Nivel", (200, 200, 50)),
+            (self.btn_menu, "Ir al Menú", (200, 50, 50))
+        ]
+    
+    def draw_pause_button(self, rect, text, color, is_hover):
+        draw_color = color if is_hover else (color[0]//2, color[1]//2, color[2]//2)
+        
+        pygame.draw.rect(self.screen, draw_color, rect, border_radius=10)
+        pygame.draw.rect(self.screen, (255, 255, 255), rect, 2, border_radius=10)
+        
+        txt_surf = render_text(get_font(40), text, (255, 255, 255))
+        txt_rect = txt_surf.get_rect(center=rect.center)
+        self.screen.blit(txt_surf, txt_rect)
+        return rect
+    
+    def build_pause_layer(self):
+        # El mundo pausado se dibuja una sola vez, con el overlay y los botones sin hover
+        self.draw()
         
         if self.pause_overlay.get_size() != (self.width, self.height):
             self.pause_overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
             self.pause_overlay.fill((0, 0, 0, 150))
         self.screen.blit(self.pause_overlay, (0, 0))
         
-        center_x = self.width // 2
-        center_y = self.height // 2
-        
-        font_title = pygame.font.Font(None, 80)
-        text = font_title.render("PAUSA", True, (255, 255, 255))
-        text_rect = text.get_rect(center=(center_x, center_y - 100))
+        font_title = get_font(80)
+        text = render_text(font_title, "PAUSA", (255, 255, 255))
+        text_rect = text.get_rect(center=(self.width // 2, self.height // 2 - 100))
         self.screen.blit(text, text_rect)
         
+        for rect, text, color in self.pause_buttons():
+            self.draw_pause_button(rect, text, color, False)
+        return self.screen.copy()
+
+    def draw_pause_menu(self):
+        center_x = self.width // 2
+        center_y = self.height // 2
         self.btn_resume.center = (center_x, center_y)
         self.btn_restart.center = (center_x, center_y + 70)
         self.btn_menu.center = (center_x, center_y + 140)
         
-        mouse_pos = pygame.mouse.get_pos()
-        font_btn = pygame.font.Font(None, 40)
+        frame = self.pause_frame
+        self.show_frame(frame)
+        frame.prepare((self.width, self.height), self.build_pause_layer)
         
-        buttons = [
-            (self.btn_resume, "Continuar", (50, 200, 50)),
-            (self.btn_restart, "Reiniciar Nivel", (200, 200, 50)),
-            (self.btn_menu, "Ir al Menú", (200, 50, 50))
-        ]
+        mouse_pos = pygame.mouse.get_pos()
+        buttons = self.pause_buttons()
+        hovered = tuple(rect.collidepoint(mouse_pos) for rect, _, _ in buttons)
+        if not frame.changed(hovered):
+            return
         
-        for rect, text, color in buttons:
-            is_hover = rect.collidepoint(mouse_pos)
-            draw_color = color if is_hover else (color[0]//2, color[1]//2, color[2]//2)
-            
-            pygame.draw.rect(self.screen, draw_color, rect, border_radius=10)
-            pygame.draw.rect(self.screen, (255, 255, 255), rect, 2, border_radius=10)
-            
-            txt_surf = font_btn.render(text, True, (255, 255, 255))
-            txt_rect = txt_surf.get_rect(center=rect.center)
-            self.screen.blit(txt_surf, txt_rect)
+        frame.begin(self.screen)
+        rects = []
+        for (rect, text, color), is_hover in zip(buttons, hovered):
+            if is_hover:
+                rects.append(self.draw_pause_button(rect, text, color, True))
+        frame.present(rects)
+
+    def wait_for_input(self, animated):
+        """
+        Limita los menus: a FPS mientras hay animacion y alguien interactua; si no,
+        el hilo duerme hasta el siguiente evento (o MENU_IDLE_FPS si hay animacion).
+        """
+        self.clock.tick(FPS)
+        idle = time.perf_counter() - self.last_input >= MENU_IDLE_DELAY
+        if animated and not idle:
+            return
+        if idle and not self.assets_preloaded:
+            if self.preload is None:
+                self.preload = self.preload_steps()
+            try:
+                next(self.preload)
+            except StopIteration:
+                self.preload = None
+                self.assets_preloaded = True
+            return
+        event = pygame.event.wait(1000 // MENU_IDLE_FPS)
+        if event.type != pygame.NOEVENT:
+            # Se devuelve a la cola para que lo procese el bucle principal
+            pygame.event.post(event)
 
     def run(self):
         running = True
+        tick_time = 1.0 / TICK_RATE
+        accumulator = 0.0
+        last_time = time.perf_counter()
+        first_frame = True
         while running:
+            now = time.perf_counter()
+            if self.level_loaded:
+                # El tiempo de carga del nivel no se simula como una rafaga de ticks
+                self.level_loaded = False
+                last_time = now
+                accumulator = 0.0
+            # Un frame larguisimo (ventana arrastrada, pausa del SO) no se convierte en una rafaga de ticks
+            frame_time = min(now - last_time, MAX_FRAME_TIME)
+            last_time = now
+            
+            self.perf.begin_frame()
+            self.perf.start("events")
             for event in pygame.event.get():
+                self.last_input = now
                 if event.type == pygame.QUIT:
                     running = False
                 
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.perf.toggle()
+                
                 elif event.type == pygame.VIDEORESIZE:
                     self.width = event.w
                     self.height = event.h
                     self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
                     if self.level:
                         self.level.handle_resize(self.width, self.height)
+                    self.presented_frame = None
+                
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.presented_frame = None
                 
                 if self.game_state == "menu":
                     if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -405,6 +563,7 @@ class Game:
                             editor = level_editor.LevelEditor()
                             editor.run()
                             self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
+                            self.presented_frame = None
                             pygame.display.set_caption("Mi Juego de Puzzle")
 
                 elif self.game_state == "level_selection":
@@ -422,6 +581,7 @@ class Game:
                     if event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_ESCAPE:
                             self.game_state = "paused"
+                            self.pause_frame.invalidate()
                         else:
                             self.handle_keypress(event.key)
                     
@@ -448,29 +608,58 @@ class Game:
                         elif self.btn_menu.collidepoint(event.pos):
                             self.game_state = "menu"
                             self.lives = 3
+            self.perf.stop("events")
+            
+            if self.game_state not in ("playing", "game_over"):
+                accumulator = 0.0
             
             if self.game_state == "menu":
                 self.draw_menu()
-                self.clock.tick(FPS)
+                if first_frame:
+                    first_frame = False
+                    startup_profile.mark("primer frame del menu")
+                    startup_profile.report("hasta el primer frame interactivo")
+                self.wait_for_input(animated=True)
                 continue
             
             elif self.game_state == "level_selection":
                 self.draw_level_selection()
+                self.wait_for_input(animated=False)
+                continue
 
             elif self.game_state == "paused":
                 self.draw_pause_menu()
+                self.wait_for_input(animated=False)
+                continue
 
-            elif self.game_state == "playing":
-                self.update()
-                self.draw()
-            elif self.game_state == "game_over":
-                self.update_game_over()
-                self.draw_game_over()
+            elif self.game_state in ("playing", "game_over"):
+                accumulator += frame_time
+                ticks = 0
+                while accumulator >= tick_time and ticks < MAX_TICKS_PER_FRAME:
+                    self.simulate_tick()
+                    accumulator -= tick_time
+                    ticks += 1
+                    if self.game_state not in ("playing", "game_over"):
+                        break
+                
+                if accumulator >= tick_time:
+                    # Si la simulacion no alcanza, se descarta el atraso en vez de acumularlo (espiral de la muerte)
+                    accumulator %= tick_time
+                
+                if self.game_state == "playing":
+                    self.draw(accumulator / tick_time)
+                    self.perf.set_counts(ticks_por_frame=ticks)
+                    self.perf.draw(self.screen)
+                elif self.game_state == "game_over":
+                    self.draw_game_over()
             elif self.game_state == "game_complete":
                 self.draw()
             
+            self.perf.start("flip")
             pygame.display.flip()
-            self.clock.tick(FPS)
+            self.perf.stop("flip")
+            self.presented_frame = None
+            self.clock.tick(RENDER_FPS if self.game_state == "playing" else FPS)
         
         pygame.quit()
     
@@ -500,15 +689,30 @@ class Game:
             self.width = windowed_width
             self.height = windowed_height
     
+    def get_keys(self):
+        if self.input_source:
+            return self.input_source.get_pressed()
+        return pygame.key.get_pressed()
+    
+    def simulate_tick(self):
+        if self.game_state == "playing":
+            self.update()
+        elif self.game_state == "game_over":
+            self.update_game_over()
+    
     def update(self):
-        keys = pygame.key.get_pressed()
+        keys = self.get_keys()
         
-        projectile = self.player.update(keys, self.level.platforms)
+        self.perf.start("player")
+        projectile = self.player.update(keys, self.level)
         if projectile:
             self.projectiles.append(projectile)
+        self.perf.stop("player")
         
         self.camera.update(self.player.rect)
+        self.perf.start("level")
         level_state = self.level.update(self.player, self)
+        self.perf.stop("level")
         
         if level_state == "game_over":
             self.game_state = "game_over"
@@ -516,16 +720,20 @@ class Game:
             self.death_message = "¡EL JEFE TE ATRAPÓ!" if self.level.boss else "¡UN MONSTRUO TE ATRAPÓ!"
             return
         
-        for proj in self.projectiles[:]:
-            proj.update(self.level.platforms)
+        self.perf.start("projectiles")
+        # Un proyectil que impacta sigue en la lista (y se dibuja) hasta el siguiente update
+        keep = 0
+        for proj in self.projectiles:
+            proj.update(self.level)
             if not proj.alive:
-                self.projectiles.remove(proj)
-            else:
-                for monster in self.level.monsters[:]:
-                    if proj.rect.colliderect(monster.rect) and not monster.is_dying:
-                        monster.take_damage()
-                        proj.alive = False
-                        break
+                proj.release()
+                continue
+            if self.level.hit_monster(proj.rect):
+                proj.alive = False
+            self.projectiles[keep] = proj
+            keep += 1
+        del self.projectiles[keep:]
+        self.perf.stop("projectiles")
         
         if self.level.check_section_complete(self.player):
             next_index = self.current_level_index + 1
@@ -546,59 +754,77 @@ class Game:
         if self.game_over_timer <= 0:
             self.reset_current_level()
     
-    def draw(self):
+    def draw(self, alpha=1.0):
+        self.camera.begin_frame(self.screen, alpha)
         self.level.draw_background(self.screen)
+        self.perf.start("level_draw")
         self.level.draw_with_camera(self.screen, self.camera)
+        self.perf.stop("level_draw")
         
         for proj in self.projectiles:
-            proj_rect = self.camera.apply(proj.rect)
+            if not self.camera.is_visible(proj.rect):
+                continue
+            proj_rect = self.camera.apply(self.camera.lerp(proj.rect, proj.prev_pos))
             proj.draw_at(self.screen, proj_rect.topleft)
         
-        player_rect = self.camera.apply(self.player.rect)
+        player_rect = self.camera.apply(self.camera.lerp(self.player.rect, self.player.prev_pos))
         self.player.draw_at(self.screen, player_rect.topleft)
         
+        self.perf.start("ui")
         self.draw_ui()
+        self.perf.stop("ui")
+        
+        self.perf.set_counts(
+            monstruos=self.level.monster_count(),
+            proyectiles_jefe=len(self.level.boss.projectiles) if self.level.boss else 0,
+            proyectiles_jugador=len(self.projectiles),
+            chunks_dibujados=self.level.chunks_drawn,
+            dibujados=self.camera.drawn_count,
+            descartados=self.camera.culled_count,
+        )
     
     def draw_ui(self):
-        font = pygame.font.Font(None, 30)
-        message_font = pygame.font.Font(None, 36)
+        font = get_font(30)
+        message_font = get_font(36)
         
-        text = font.render(f"Saltos: {self.player.jumps_left}/{self.player.max_jumps}", True, (0, 0, 0))
+        text = render_text(font, f"Saltos: {self.player.jumps_left}/{self.player.max_jumps}", (0, 0, 0))
         self.screen.blit(text, (12, 12))
-        text = font.render(f"Saltos: {self.player.jumps_left}/{self.player.max_jumps}", True, (255, 255, 255))
+        text = render_text(font, f"Saltos: {self.player.jumps_left}/{self.player.max_jumps}", (255, 255, 255))
         self.screen.blit(text, (10, 10))
         
         if self.player.cast_cooldown > 0:
-            text = font.render(f"Cooldown: {self.player.cast_cooldown}", True, (0, 0, 0))
+            text = render_text(font, f"Cooldown: {self.player.cast_cooldown}", (0, 0, 0))
             self.screen.blit(text, (12, 42))
-            text = font.render(f"Cooldown: {self.player.cast_cooldown}", True, (255, 100, 100))
+            text = render_text(font, f"Cooldown: {self.player.cast_cooldown}", (255, 100, 100))
             self.screen.blit(text, (10, 40))
         
-        small_font = pygame.font.Font(None, 20)
+        small_font = get_font(20)
         level_name = "N/A"
         if 0 <= self.current_level_index < len(self.level_order):
             level_name = self.level_order[self.current_level_index].split("/")[-1].replace(".txt", "")
-        mode_text = small_font.render(
+        mode_text = render_text(
+            small_font,
             f"Nivel: {level_name} ({self.current_level_index + 1}/{len(self.level_order)}) | F11=Fullscreen | F=Disparar", 
-            True, (200, 200, 200)
+            (200, 200, 200)
         )
         self.screen.blit(mode_text, (self.width - 550, 10))
         
         if 0 <= self.current_level_index < len(self.level_order):
             if "level3" in self.level_order[self.current_level_index]:
-                if self.life_icon:
-                    self.screen.blit(self.life_icon, (20, 50))
+                life_icon = self.get_life_icon()
+                if life_icon:
+                    self.screen.blit(life_icon, (20, 50))
                 else:
                     pygame.draw.circle(self.screen, (255, 50, 50), (36, 66), 16)
                 
                 lives_color = (255, 255, 255)
                 if self.lives < 0:
                     lives_color = (255, 50, 50)
-                lives_surf = message_font.render(f"x {self.lives}", True, lives_color)
+                lives_surf = render_text(message_font, f"x {self.lives}", lives_color)
                 self.screen.blit(lives_surf, (60, 55))
         
         if 0 <= self.current_level_index < len(self.level_order):
-            button_font = pygame.font.Font(None, 24)
+            button_font = get_font(24)
             for button in self.color_buttons:
                 if button["color"] == self.current_color:
                     border_color = (255, 255, 0)
@@ -609,14 +835,14 @@ class Game:
                 
                 pygame.draw.rect(self.screen, button["bg"], button["rect"])
                 pygame.draw.rect(self.screen, border_color, button["rect"], border_width)
-                text = button_font.render(button["text"], True, (255, 255, 255))
+                text = render_text(button_font, button["text"], (255, 255, 255))
                 text_rect = text.get_rect(center=button["rect"].center)
                 self.screen.blit(text, text_rect)
         
         if self.level_message:
-            message_surf = message_font.render(self.level_message, True, (255, 255, 100))
+            message_surf = render_text(message_font, self.level_message, (255, 255, 100))
             message_rect = message_surf.get_rect(center=(self.width // 2, 50))
-            shadow = message_font.render(self.level_message, True, (0, 0, 0))
+            shadow = render_text(message_font, self.level_message, (0, 0, 0))
             self.screen.blit(shadow, (message_rect.x + 2, message_rect.y + 2))
             self.screen.blit(message_surf, message_rect)
     
@@ -627,22 +853,22 @@ class Game:
         overlay.fill((20, 0, 0))
         self.screen.blit(overlay, (0, 0))
         
-        big_font = pygame.font.Font(None, 100)
-        text = big_font.render("GAME OVER", True, (255, 50, 50))
+        big_font = get_font(100)
+        text = render_text(big_font, "GAME OVER", (255, 50, 50))
         text_rect = text.get_rect(center=(self.width // 2, self.height // 2 - 60))
         self.screen.blit(text, text_rect)
         
-        med_font = pygame.font.Font(None, 40)
-        msg = med_font.render(self.death_message, True, (255, 200, 200))
+        med_font = get_font(40)
+        msg = render_text(med_font, self.death_message, (255, 200, 200))
         msg_rect = msg.get_rect(center=(self.width // 2, self.height // 2 + 20))
         self.screen.blit(msg, msg_rect)
         
-        small_font = pygame.font.Font(None, 30)
+        small_font = get_font(30)
         if self.game_over_timer > 60:
             timer_text = f"Reiniciando en {self.game_over_timer // 60}..."
-            text = small_font.render(timer_text, True, (255, 255, 255))
+            text = render_text(small_font, timer_text, (255, 255, 255))
         else:
-            text = small_font.render("Presiona ESPACIO para reiniciar", True, (255, 255, 100))
+            text = render_text(small_font, "Presiona ESPACIO para reiniciar", (255, 255, 100))
         text_rect = text.get_rect(center=(self.width // 2, self.height // 2 + 80))
         self.screen.blit(text, text_rect)
 
@@ -3,15 +3,25 @@ import random
 import math
 
 class Monster(pygame.sprite.Sprite):
-    def __init__(self, x, y, monster_type="goblin"):
+    base_path = "Monsters_Creatures_Fantasy/Monsters_Creatures_Fantasy"
+    _prototypes = {}
+    _frame_cache = {}
+    _cached_sizes = set()
+    
+    # Atributos que cambian durante el juego; el resto sale del tipo
+    STATE_FIELDS = ("x", "y", "vel_x", "vel_y", "alive", "health", "on_ground",
+                    "current_animation", "current_frame", "frame_counter", "direction",
+                    "is_attacking", "is_dying", "death_timer", "is_tracking", "wander_timer")
+    
+    def __init__(self, x, y, monster_type="goblin", wander_direction=None):
         super().__init__()
         
         self.monster_type = monster_type
-        self.base_path = f"Monsters_Creatures_Fantasy/Monsters_Creatures_Fantasy"
         
         self.x = float(x)
         self.y = float(y)
         self.rect = pygame.Rect(int(x), int(y), 80, 80)
+        self.prev_pos = self.rect.topleft
         
         self.speed = 1.0
         self.vel_x = 0
@@ -42,13 +52,42 @@ class Monster(pygame.sprite.Sprite):
         self.is_tracking = False
         
         self.wander_timer = 0
-        self.wander_direction = random.choice([-1, 1])
+        if wander_direction is None:
+            wander_direction = random.choice([-1, 1])
+        self.wander_direction = wander_direction
         
-        self.animations = {}
-        self.frame_counts = {}
         self.load_sprites()
     
     def load_sprites(self):
+        self.animations, self.frame_counts = Monster.prototype(self.monster_type)
+    
+    def suspend(self):
+        """Estado compacto del monstruo mientras su chunk esta lejos de la camara"""
+        return (self.monster_type, self.rect.x, self.rect.y, self.wander_direction) + \
+            tuple(getattr(self, name) for name in self.STATE_FIELDS)
+    
+    @classmethod
+    def restore(cls, state):
+        monster_type, rect_x, rect_y, wander_direction = state[:4]
+        monster = cls(rect_x, rect_y, monster_type, wander_direction)
+        for name, value in zip(cls.STATE_FIELDS, state[4:]):
+            setattr(monster, name, value)
+        return monster
+    
+    @classmethod
+    def prototype(cls, monster_type):
+        # Las hojas se decodifican una sola vez por tipo y se comparten entre instancias
+        prototype = cls._prototypes.get(monster_type)
+        if prototype is None:
+            prototype = cls._build_prototype(monster_type)
+            cls._prototypes[monster_type] = prototype
+        return prototype
+    
+    @classmethod
+    def _build_prototype(cls, monster_type):
+        animations = {}
+        frame_counts = {}
+        
         try:
             type_folders = {
                 "flying_eye": "Flying eye",
@@ -57,17 +96,17 @@ class Monster(pygame.sprite.Sprite):
                 "mushroom": "Mushroom"
             }
             
-            folder = type_folders.get(self.monster_type, "Goblin")
-            base = f"{self.base_path}/{folder}"
+            folder = type_folders.get(monster_type, "Goblin")
+            base = f"{cls.base_path}/{folder}"
             
-            if self.monster_type == "flying_eye":
+            if monster_type == "flying_eye":
                 anim_map = {
                     "flight": "Flight.png",
                     "attack": "Attack.png",
                     "death": "Death.png",
                     "hurt": "Take Hit.png"
                 }
-            elif self.monster_type == "goblin":
+            elif monster_type == "goblin":
                 anim_map = {
                     "idle": "Idle.png",
                     "walk": "Run.png",
@@ -75,7 +114,7 @@ class Monster(pygame.sprite.Sprite):
                     "death": "Death.png",
                     "hurt": "Take Hit.png"
                 }
-            elif self.monster_type == "skeleton":
+            elif monster_type == "skeleton":
                 anim_map = {
                     "idle": "Idle.png",
                     "walk": "Walk.png",
@@ -95,22 +134,24 @@ class Monster(pygame.sprite.Sprite):
             for anim_name, filename in anim_map.items():
                 try:
                     sprite = pygame.image.load(f"{base}/{filename}")
-                    self.animations[anim_name] = sprite
+                    animations[anim_name] = sprite
                     
                     frame_width = 150
                     num_frames = max(1, sprite.get_width() // frame_width)
-                    self.frame_counts[anim_name] = num_frames
+                    frame_counts[anim_name] = num_frames
                     
                 except Exception:
                     pass
             
-            if not self.animations:
+            if not animations:
                 raise Exception()
                 
         except Exception:
-            self.animations = {"idle": pygame.Surface((150, 150))}
-            self.animations["idle"].fill((255, 0, 255))
-            self.frame_counts = {"idle": 1}
+            animations = {"idle": pygame.Surface((150, 150))}
+            animations["idle"].fill((255, 0, 255))
+            frame_counts = {"idle": 1}
+        
+        return animations, frame_counts
     
     def update_ai(self, player, game):
         if self.is_dying:
@@ -189,40 +230,20 @@ class Monster(pygame.sprite.Sprite):
         
         self._update_animation()
     
-    def update_movement(self, platforms):
+    def update_movement(self, level):
+        self.prev_pos = self.rect.topleft
+        
         self.x += self.vel_x
         self.rect.x = int(self.x)
         
         if not self.is_flying:
-            for platform in platforms:
-                platform_rect = platform['rect'] if isinstance(platform, dict) else platform
-                
-                if self.rect.colliderect(platform_rect):
-                    if self.vel_x > 0:
-                        self.rect.right = platform_rect.left
-                        self.x = self.rect.x
-                    elif self.vel_x < 0:
-                        self.rect.left = platform_rect.right
-                        self.x = self.rect.x
+            level.resolve_horizontal(self)
         
         self.y += self.vel_y
         self.rect.y = int(self.y)
         
         if not self.is_flying:
-            self.on_ground = False
-            for platform in platforms:
-                platform_rect = platform['rect'] if isinstance(platform, dict) else platform
-                
-                if self.rect.colliderect(platform_rect):
-                    if self.vel_y > 0:
-                        self.rect.bottom = platform_rect.top
-                        self.y = self.rect.y
-                        self.vel_y = 0
-                        self.on_ground = True
-                    elif self.vel_y < 0:
-                        self.rect.top = platform_rect.bottom
-                        self.y = self.rect.y
-                        self.vel_y = 0
+            self.on_ground = level.resolve_vertical(self)
     
     def _update_animation(self):
         if self.is_dying:
@@ -260,30 +281,64 @@ class Monster(pygame.sprite.Sprite):
         if self.current_animation not in self.animations:
             self.current_animation = list(self.animations.keys())[0]
         
-        current_sheet = self.animations[self.current_animation]
-        
+        return self._extract_frame(self.animations[self.current_animation], self.current_frame)
+    
+    @staticmethod
+    def _extract_frame(sheet, frame_index):
         frame_width = 150
         frame_height = 150
         
-        frame_x = self.current_frame * frame_width
+        frame_x = frame_index * frame_width
         frame_y = 0
         
         try:
-            return current_sheet.subsurface(pygame.Rect(frame_x, frame_y, frame_width, frame_height))
+            return sheet.subsurface(pygame.Rect(frame_x, frame_y, frame_width, frame_height))
         except:
-            return current_sheet
+            return sheet
     
-    def draw_with_camera(self, surface, camera):
-        screen_rect = camera.apply(self.rect)
+    @classmethod
+    def _cache_frames(cls, monster_type, size):
+        # Escala y voltea todos los frames del tipo una sola vez para este tamaño
+        animations, frame_counts = cls.prototype(monster_type)
+        for anim_name in animations:
+            for frame_index in range(frame_counts.get(anim_name, 1)):
+                cls._cache_frame(monster_type, anim_name, frame_index, size)
+    
+    @classmethod
+    def _cache_frame(cls, monster_type, anim_name, frame_index, size):
+        animations, _ = cls.prototype(monster_type)
+        frame = cls._extract_frame(animations[anim_name], frame_index)
+        scaled = pygame.transform.scale(frame, size)
+        if pygame.display.get_surface() is not None:
+            scaled = scaled.convert_alpha()
         
-        frame = self.get_current_frame()
+        cls._frame_cache[(monster_type, anim_name, frame_index, False, size)] = scaled
+        cls._frame_cache[(monster_type, anim_name, frame_index, True, size)] = pygame.transform.flip(scaled, True, False)
+    
+    @classmethod
+    def scaled_frame(cls, monster_type, anim_name, frame_index, flipped, size):
+        key = (monster_type, anim_name, frame_index, flipped, size)
+        frame = cls._frame_cache.get(key)
+        if frame is None:
+            if (monster_type, size) not in cls._cached_sizes:
+                cls._cached_sizes.add((monster_type, size))
+                cls._cache_frames(monster_type, size)
+            if key not in cls._frame_cache:
+                cls._cache_frame(monster_type, anim_name, frame_index, size)
+            frame = cls._frame_cache[key]
         
-        scaled_frame = pygame.transform.scale(frame, (self.rect.width + 20, self.rect.height + 20))
+        return frame
+    
+    def get_scaled_frame(self, size):
+        if self.current_animation not in self.animations:
+            self.current_animation = list(self.animations.keys())[0]
         
-        if self.direction == 1:
-            scaled_frame = pygame.transform.flip(scaled_frame, True, False)
+        return Monster.scaled_frame(self.monster_type, self.current_animation, self.current_frame,
+                                    self.direction == 1, size)
+    
+    def draw_with_camera(self, surface, camera):
+        screen_rect = camera.apply(camera.lerp(self.rect, self.prev_pos))
         
-        draw_x = screen_rect.x - 10
-        draw_y = screen_rect.y - 10
+        frame = self.get_scaled_frame((self.rect.width + 20, self.rect.height + 20))
         
-        surface.blit(scaled_frame, (draw_x, draw_y))
\ No newline at end of file
+        surface.blit(frame, (screen_rect.x - 10, screen_rect.y - 10))
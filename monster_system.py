@@ -0,0 +1,480 @@
+import random
+import numpy as np
+from config import TILE_SIZE
+from monster import Monster
+from spatial_hash import HIT_CELL_SIZE
+
+ANIMATIONS = ["idle", "walk", "flight", "attack", "death", "hurt"]
+IDLE, WALK, FLIGHT, ATTACK, DEATH, HURT = range(len(ANIMATIONS))
+
+MONSTER_SIZE = 80
+DRAW_SIZE = (MONSTER_SIZE + 20, MONSTER_SIZE + 20)
+
+SPEED = 1.0
+GRAVITY = 0.4
+MAX_FALL_SPEED = 15
+ANIMATION_SPEED = 8
+DETECTION_RANGE = 400
+DEATH_TIME = 30
+
+FIELDS = {
+    "x": np.float64,
+    "y": np.float64,
+    "vel_x": np.float64,
+    "vel_y": np.float64,
+    "rect_x": np.int64,
+    "rect_y": np.int64,
+    "prev_x": np.int64,
+    "prev_y": np.int64,
+    "type": np.int16,
+    "anim": np.int8,
+    "frame": np.int16,
+    "frame_counter": np.int16,
+    "direction": np.int8,
+    "health": np.int16,
+    "death_timer": np.int16,
+    "wander_timer": np.int32,
+    "wander_direction": np.int8,
+    "flying": np.bool_,
+    "alive": np.bool_,
+    "dying": np.bool_,
+    "tracking": np.bool_,
+    "on_ground": np.bool_,
+}
+
+
+class MonsterSystem:
+    """
+    Monstruos guardados en arreglos NumPy (uno por campo) y simulados todos a la vez.
+    Reproduce update_ai, update_movement y _update_animation de Monster, incluida la
+    resolucion de colisiones de Level.colliding_tiles, para hordas de miles de monstruos.
+    """
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+        self.type_names = []
+        self.type_index = {}
+        self.frame_counts = np.zeros((0, len(ANIMATIONS)), dtype=np.int16)
+        # Se crea al primer tick camuflado, para no mover la secuencia de random al cargar el nivel
+        self.rng = None
+        self.solid_grid = np.zeros((0, 0), dtype=np.bool_)
+        self.broadphase_dirty = True
+
+    def build_solid_grid(self, level):
+        # Rejilla booleana [fila, columna] de celdas solidas, igual que level.platform_grid
+        if level.streamer is not None:
+            # Con streaming platform_grid solo tiene los chunks activos
+            self.solid_grid = level.streamer.solid_grid()
+            return
+        if level.platform_grid:
+            cols = max(col for col, _ in level.platform_grid) + 1
+            rows = max(row for _, row in level.platform_grid) + 1
+        else:
+            cols = rows = 0
+        self.solid_grid = np.zeros((rows, cols), dtype=np.bool_)
+        for col, row in level.platform_grid:
+            self.solid_grid[row, col] = True
+
+    def solid(self, cols, rows):
+        rows_total, cols_total = self.solid_grid.shape
+        inside = (cols >= 0) & (cols < cols_total) & (rows >= 0) & (rows < rows_total)
+        result = np.zeros(cols.shape, dtype=np.bool_)
+        result[inside] = self.solid_grid[rows[inside], cols[inside]]
+        return result
+
+    def register_type(self, monster_type):
+        index = self.type_index.get(monster_type)
+        if index is None:
+            _, frame_counts = Monster.prototype(monster_type)
+            row = [frame_counts.get(name, 0) for name in ANIMATIONS]
+            self.frame_counts = np.vstack([self.frame_counts, np.array([row], dtype=np.int16)])
+            index = len(self.type_names)
+            self.type_names.append(monster_type)
+            self.type_index[monster_type] = index
+        return index
+
+    def grow(self):
+        self.capacity *= 2
+        for name in FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self, x, y, monster_type="goblin"):
+        if self.count == self.capacity:
+            self.grow()
+
+        i = self.count
+        flying = monster_type == "flying_eye"
+        self.x[i] = float(x)
+        self.y[i] = float(y)
+        self.rect_x[i] = int(x)
+        self.rect_y[i] = int(y)
+        self.prev_x[i] = self.rect_x[i]
+        self.prev_y[i] = self.rect_y[i]
+        self.vel_x[i] = 0
+        self.vel_y[i] = 0
+        self.type[i] = self.register_type(monster_type)
+        self.anim[i] = FLIGHT if flying else IDLE
+        self.frame[i] = 0
+        self.frame_counter[i] = 0
+        self.direction[i] = 1
+        self.health[i] = 1
+        self.death_timer[i] = 0
+        self.wander_timer[i] = 0
+        # Misma llamada que Monster.__init__, para no alterar la secuencia de random
+        self.wander_direction[i] = random.choice([-1, 1])
+        self.flying[i] = flying
+        self.alive[i] = True
+        self.dying[i] = False
+        self.tracking[i] = False
+        self.on_ground[i] = False
+        self.count += 1
+        self.broadphase_dirty = True
+        return i
+
+    def __len__(self):
+        return self.count
+
+    def update(self, player, camouflaged):
+        """Avanza un tick. Devuelve (choca con el jugador, monstruos eliminados)."""
+        n = self.count
+        if n == 0:
+            return False, 0
+
+        self.update_ai(n, player, camouflaged)
+        self.update_movement(n)
+        self.broadphase_dirty = True
+
+        hit_player = bool(self.overlapping(player.rect, n).any())
+        removed = self.remove_dead(n)
+        return hit_player, removed
+
+    def update_ai(self, n, player, camouflaged):
+        dying = self.dying[:n]
+        death_timer = self.death_timer[:n]
+        death_timer[dying] -= 1
+        self.alive[:n][dying & (death_timer <= 0)] = False
+
+        active = ~dying
+        flying = self.flying[:n]
+        vel_x = self.vel_x[:n]
+        vel_y = self.vel_y[:n]
+        anim = self.anim[:n]
+        direction = self.direction[:n]
+
+        if camouflaged:
+            if self.rng is None:
+                self.rng = np.random.default_rng(random.getrandbits(32))
+            self.tracking[:n][active] = False
+
+            wander_timer = self.wander_timer[:n]
+            wander_direction = self.wander_direction[:n]
+            wander_timer[active] -= 1
+            reroll = active & (wander_timer <= 0)
+            rerolls = int(reroll.sum())
+            if rerolls:
+                wander_timer[reroll] = self.rng.integers(60, 121, rerolls)
+                wander_direction[reroll] = self.rng.choice([-1, 0, 1], rerolls)
+
+            moving = active & (wander_direction != 0)
+            vel_x[moving] = SPEED * 0.5 * wander_direction[moving]
+            direction[moving] = np.where(wander_direction[moving] > 0, 3, 1)
+            vel_x[active & (wander_direction == 0)] = 0
+
+            flyers = active & flying
+            drift = flyers & (self.rng.random(n) < 0.02)
+            drifts = int(drift.sum())
+            if drifts:
+                vel_y[drift] = self.rng.choice([-SPEED * 0.5, 0, SPEED * 0.5], drifts)
+            anim[flyers] = FLIGHT
+
+            walkers = active & ~flying
+            anim[walkers & moving] = WALK
+            anim[walkers & ~moving] = IDLE
+        else:
+            dx = (player.rect.centerx - (self.rect_x[:n] + MONSTER_SIZE // 2)).astype(np.float64)
+            dy = (player.rect.centery - (self.rect_y[:n] + MONSTER_SIZE // 2)).astype(np.float64)
+            distance = np.sqrt(dx ** 2 + dy ** 2)
+
+            tracking = active & (distance < DETECTION_RANGE)
+            self.tracking[:n][active] = tracking[active]
+            step_x = np.where(dx > 0, SPEED, -SPEED)
+            facing = np.where(dx > 0, 3, 1)
+
+            flyers = tracking & flying
+            chase_x = flyers & (np.abs(dx) > 10)
+            vel_x[chase_x] = step_x[chase_x]
+            direction[chase_x] = facing[chase_x]
+            vel_x[flyers & ~chase_x] = 0
+            chase_y = flyers & (np.abs(dy) > 10)
+            vel_y[chase_y] = np.where(dy[chase_y] > 0, SPEED, -SPEED)
+            vel_y[flyers & ~chase_y] = 0
+            anim[flyers] = FLIGHT
+
+            walkers = tracking & ~flying
+            chase_x = walkers & (np.abs(dx) > 20)
+            vel_x[chase_x] = step_x[chase_x]
+            direction[chase_x] = facing[chase_x]
+            anim[chase_x] = WALK
+            vel_x[walkers & ~chase_x] = 0
+            anim[walkers & ~chase_x] = IDLE
+
+            idle = active & ~tracking
+            vel_x[idle] = 0
+            anim[idle] = np.where(flying[idle], FLIGHT, IDLE)
+
+        falling = active & ~flying
+        vel_y[falling] = np.minimum(vel_y[falling] + GRAVITY, MAX_FALL_SPEED)
+
+        self.update_animation(n, active)
+
+    def update_animation(self, n, active):
+        anim = self.anim[:n]
+        frame = self.frame[:n]
+        frame_counter = self.frame_counter[:n]
+
+        max_frames = self.frame_counts[self.type[:n], anim]
+        animated = active & (max_frames > 0)
+        frame_counter[animated] += 1
+
+        advance = animated & (frame_counter >= ANIMATION_SPEED)
+        death = advance & (anim == DEATH)
+        frame[death] = np.where(frame[death] < max_frames[death] - 1, frame[death] + 1, frame[death])
+        loop = advance & (anim != DEATH)
+        frame[loop] = (frame[loop] + 1) % max_frames[loop]
+        frame_counter[advance] = 0
+
+    def update_movement(self, n):
+        x = self.x[:n]
+        y = self.y[:n]
+        rect_x = self.rect_x[:n]
+        rect_y = self.rect_y[:n]
+        walkers = ~self.flying[:n]
+        self.prev_x[:n] = rect_x
+        self.prev_y[:n] = rect_y
+
+        x += self.vel_x[:n]
+        rect_x[:] = x.astype(np.int64)
+        self.resolve_horizontal(np.flatnonzero(walkers & (self.vel_x[:n] != 0)))
+
+        y += self.vel_y[:n]
+        rect_y[:] = y.astype(np.int64)
+        self.resolve_vertical(np.flatnonzero(walkers))
+
+    def resolve_horizontal(self, idx):
+        # Mismo recorrido que Level.colliding_tiles: filas de arriba a abajo y, en cada fila,
+        # columnas de izquierda a derecha recalculadas tras cada empuje (vel_x no se anula)
+        if len(idx) == 0:
+            return
+
+        left = self.rect_x[idx]
+        top = self.rect_y[idx]
+        moving_right = self.vel_x[idx] > 0
+        first_row = top // TILE_SIZE
+        last_row = (top + MONSTER_SIZE - 1) // TILE_SIZE
+        max_cols = (MONSTER_SIZE + TILE_SIZE - 2) // TILE_SIZE + 1
+
+        row = first_row.copy()
+        pending = row <= last_row
+        while pending.any():
+            col = left // TILE_SIZE
+            scanning = pending.copy()
+            while scanning.any():
+                last_col = (left + MONSTER_SIZE - 1) // TILE_SIZE
+                hit_col = np.full(len(idx), -1, dtype=np.int64)
+                for offset in range(max_cols):
+                    candidate = col + offset
+                    hit = scanning & (hit_col < 0) & (candidate <= last_col) & self.solid(candidate, row)
+                    hit_col[hit] = candidate[hit]
+
+                found = scanning & (hit_col >= 0)
+                push_left = found & moving_right
+                push_right = found & ~moving_right
+                left[push_left] = hit_col[push_left] * TILE_SIZE - MONSTER_SIZE
+                left[push_right] = (hit_col[push_right] + 1) * TILE_SIZE
+                col[push_right] = hit_col[push_right] + 1
+                # Al empujar a la izquierda el rect ya no alcanza mas columnas de esta fila
+                scanning = push_right
+
+            row += 1
+            pending = row <= last_row
+
+        changed = left != self.rect_x[idx]
+        self.rect_x[idx] = left
+        self.x[idx[changed]] = left[changed]
+
+    def resolve_vertical(self, idx):
+        # Solo cuenta el primer tile en orden de filas: tras el choque vel_y queda en 0
+        self.on_ground[idx] = False
+        if len(idx) == 0:
+            return
+
+        left = self.rect_x[idx]
+        top = self.rect_y[idx]
+        first_col = left // TILE_SIZE
+        last_col = (left + MONSTER_SIZE - 1) // TILE_SIZE
+        first_row = top // TILE_SIZE
+        last_row = (top + MONSTER_SIZE - 1) // TILE_SIZE
+        max_cells = (MONSTER_SIZE + TILE_SIZE - 2) // TILE_SIZE + 1
+
+        hit_row = np.full(len(idx), -1, dtype=np.int64)
+        for row_offset in range(max_cells):
+            row = first_row + row_offset
+            for col_offset in range(max_cells):
+                col = first_col + col_offset
+                hit = (hit_row < 0) & (row <= last_row) & (col <= last_col) & self.solid(col, row)
+                hit_row[hit] = row[hit]
+
+        vel_y = self.vel_y[idx]
+        falling = (hit_row >= 0) & (vel_y > 0)
+        rising = (hit_row >= 0) & (vel_y < 0)
+        top[falling] = hit_row[falling] * TILE_SIZE - MONSTER_SIZE
+        top[rising] = (hit_row[rising] + 1) * TILE_SIZE
+        stopped = falling | rising
+
+        self.rect_y[idx] = top
+        self.y[idx[stopped]] = top[stopped]
+        self.vel_y[idx[stopped]] = 0
+        self.on_ground[idx[falling]] = True
+
+    def overlapping(self, rect, n=None):
+        """Mascara de monstruos vivos (no muriendo) cuyo rect choca con rect."""
+        if n is None:
+            n = self.count
+        rect_x = self.rect_x[:n]
+        rect_y = self.rect_y[:n]
+        return (~self.dying[:n] & (rect_x < rect.right) & (rect_x + MONSTER_SIZE > rect.left)
+                & (rect_y < rect.bottom) & (rect_y + MONSTER_SIZE > rect.top))
+
+    def build_broadphase(self):
+        # Misma rejilla que SpatialHash (celda de la esquina superior izquierda), armada con un
+        # ordenamiento estable: cada celda guarda sus indices en orden de aparicion
+        n = self.count
+        cells_x = self.rect_x[:n] // HIT_CELL_SIZE
+        cells_y = self.rect_y[:n] // HIT_CELL_SIZE
+        keys = cells_x * (1 << 32) + cells_y
+        order = np.argsort(keys, kind="stable")
+        cell_keys, starts = np.unique(keys[order], return_index=True)
+        ends = np.append(starts[1:], n)
+
+        order = order.tolist()
+        self.broadphase_cells = {
+            key: order[start:end]
+            for key, start, end in zip(cell_keys.tolist(), starts.tolist(), ends.tolist())
+        }
+        self.broadphase_x = self.rect_x[:n].tolist()
+        self.broadphase_y = self.rect_y[:n].tolist()
+        self.broadphase_dirty = False
+
+    def hit_test(self, rect):
+        """Indice del primer monstruo (en orden de aparicion) que choca con rect, o -1."""
+        if self.count == 0:
+            return -1
+        if self.broadphase_dirty:
+            self.build_broadphase()
+
+        cells = self.broadphase_cells
+        rect_x = self.broadphase_x
+        rect_y = self.broadphase_y
+        dying = self.dying
+        best = -1
+        for cx in range((rect.left - MONSTER_SIZE + 1) // HIT_CELL_SIZE, (rect.right - 1) // HIT_CELL_SIZE + 1):
+            for cy in range((rect.top - MONSTER_SIZE + 1) // HIT_CELL_SIZE, (rect.bottom - 1) // HIT_CELL_SIZE + 1):
+                for i in cells.get(cx * (1 << 32) + cy, ()):
+                    if best >= 0 and i > best:
+                        break
+                    if (rect_x[i] < rect.right and rect_x[i] + MONSTER_SIZE > rect.left
+                            and rect_y[i] < rect.bottom and rect_y[i] + MONSTER_SIZE > rect.top
+                            and not dying[i]):
+                        best = i
+                        break
+        return best
+
+    def take_damage(self, i):
+        if not self.dying[i]:
+            self.health[i] -= 1
+            if self.health[i] <= 0:
+                self.dying[i] = True
+                self.death_timer[i] = DEATH_TIME
+                self.frame[i] = 0
+                return True
+        return False
+
+    def remove_dead(self, n):
+        keep = self.alive[:n].copy()
+        kept = int(keep.sum())
+        if kept == n:
+            return 0
+
+        self.compact(keep, kept)
+        return n - kept
+
+    def compact(self, keep, kept):
+        n = self.count
+        for name in FIELDS:
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+        self.count = kept
+        self.broadphase_dirty = True
+
+    def extract(self, mask):
+        """Quita los monstruos marcados y devuelve sus campos (copias), para suspenderlos"""
+        n = self.count
+        rows = {name: getattr(self, name)[:n][mask] for name in FIELDS}
+        keep = ~mask
+        self.compact(keep, int(keep.sum()))
+        return rows
+
+    def insert(self, rows):
+        """Vuelve a agregar monstruos devueltos por extract"""
+        count = len(rows["x"])
+        while self.count + count > self.capacity:
+            self.grow()
+        for name in FIELDS:
+            getattr(self, name)[self.count:self.count + count] = rows[name]
+        self.count += count
+        self.broadphase_dirty = True
+
+    def frame_for(self, i):
+        monster_type = self.type_names[self.type[i]]
+        animations, _ = Monster.prototype(monster_type)
+        anim_name = ANIMATIONS[self.anim[i]]
+        if anim_name not in animations:
+            anim_name = next(iter(animations))
+        return Monster.scaled_frame(monster_type, anim_name, int(self.frame[i]),
+                                    bool(self.direction[i] == 1), DRAW_SIZE)
+
+    def draw_with_camera(self, surface, camera):
+        n = self.count
+        if n == 0:
+            return
+
+        view = camera.view
+        rect_x = self.rect_x[:n]
+        rect_y = self.rect_y[:n]
+        visible = np.flatnonzero(self.alive[:n]
+                                 & (rect_x < view.right) & (rect_x + MONSTER_SIZE > view.left)
+                                 & (rect_y < view.bottom) & (rect_y + MONSTER_SIZE > view.top))
+        camera.drawn_count += len(visible)
+        camera.culled_count += n - len(visible)
+
+        draw_x = rect_x[visible]
+        draw_y = rect_y[visible]
+        if camera.alpha < 1.0:
+            prev_x = self.prev_x[visible]
+            prev_y = self.prev_y[visible]
+            draw_x = np.round(prev_x + (draw_x - prev_x) * camera.alpha).astype(np.int64)
+            draw_y = np.round(prev_y + (draw_y - prev_y) * camera.alpha).astype(np.int64)
+
+        offset_x = camera.offset_x + 10
+        offset_y = camera.offset_y + 10
+        surface.blits([
+            (self.frame_for(i), (x - offset_x, y - offset_y))
+            for i, x, y in zip(visible.tolist(), draw_x.tolist(), draw_y.tolist())
+        ], False)
@@ -0,0 +1,121 @@
+import time
+import pygame
+from collections import deque
+from text_cache import get_font
+
+SECTIONS = [
+    ("events", "eventos"),
+    ("player", "player.update"),
+    ("level", "level.update"),
+    ("projectiles", "proyectiles"),
+    ("level_draw", "level.draw"),
+    ("ui", "draw_ui"),
+    ("flip", "display.flip"),
+]
+
+
+class PerfHUD:
+    """Overlay de rendimiento (F3): tiempo por subsistema, grafica de frames y conteos."""
+
+    def __init__(self, history=240):
+        self.enabled = False
+        self.history = history
+        self.frame_times = deque(maxlen=history)
+        self.section_times = {name: deque(maxlen=history) for name, _ in SECTIONS}
+        self.current = {}
+        self.started = {}
+        self.counts = {}
+        self.frame_start = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_times.clear()
+        for samples in self.section_times.values():
+            samples.clear()
+        self.frame_start = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.frame_times.append(now - self.frame_start)
+            for name, _ in SECTIONS:
+                self.section_times[name].append(self.current.get(name, 0.0))
+        self.frame_start = now
+        self.current = {}
+
+    def start(self, section):
+        if self.enabled:
+            self.started[section] = time.perf_counter()
+
+    def stop(self, section):
+        if self.enabled and section in self.started:
+            elapsed = time.perf_counter() - self.started.pop(section)
+            self.current[section] = self.current.get(section, 0.0) + elapsed
+
+    def set_counts(self, **counts):
+        if self.enabled:
+            self.counts.update(counts)
+
+    def percentile(self, samples, p):
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def draw(self, surface):
+        if not self.enabled:
+            return
+
+        panel = pygame.Rect(surface.get_width() - 330, 60, 320, 330)
+        background = pygame.Surface(panel.size, pygame.SRCALPHA)
+        background.fill((0, 0, 0, 180))
+        surface.blit(background, panel.topleft)
+
+        x = panel.x + 10
+        y = panel.y + 8
+
+        frames = self.frame_times
+        p50 = self.percentile(frames, 0.50) * 1000
+        p95 = self.percentile(frames, 0.95) * 1000
+        p99 = self.percentile(frames, 0.99) * 1000
+        last = frames[-1] * 1000 if frames else 0.0
+        fps = 1000.0 / last if last > 0 else 0.0
+
+        lines = [
+            (f"frame {last:5.2f} ms  ({fps:4.0f} fps)", (255, 255, 255)),
+            (f"p50 {p50:5.2f}  p95 {p95:5.2f}  p99 {p99:5.2f} ms", (255, 255, 150)),
+        ]
+        for name, label in SECTIONS:
+            samples = self.section_times[name]
+            current = samples[-1] * 1000 if samples else 0.0
+            average = sum(samples) / len(samples) * 1000 if samples else 0.0
+            lines.append((f"{label:14} {current:6.2f}  avg {average:6.2f}", (180, 220, 255)))
+        for name, value in self.counts.items():
+            lines.append((f"{name}: {value}", (180, 255, 180)))
+
+        font = get_font(20)
+        for text, color in lines:
+            surface.blit(font.render(text, True, color), (x, y))
+            y += 16
+
+        self.draw_graph(surface, pygame.Rect(x, panel.bottom - 70, panel.width - 20, 60))
+
+    def draw_graph(self, surface, rect):
+        pygame.draw.rect(surface, (60, 60, 60), rect, 1)
+        if len(self.frame_times) < 2:
+            return
+
+        scale_ms = max(33.3, max(self.frame_times) * 1000)
+        target_y = rect.bottom - int(rect.height * (1000.0 / 60) / scale_ms)
+        pygame.draw.line(surface, (80, 160, 80), (rect.left, target_y), (rect.right, target_y))
+
+        step = rect.width / (self.history - 1)
+        points = []
+        for i, frame_time in enumerate(self.frame_times):
+            px = rect.left + int(i * step)
+            py = rect.bottom - int(rect.height * min(1.0, frame_time * 1000 / scale_ms))
+            points.append((px, py))
+        pygame.draw.lines(surface, (255, 200, 80), False, points)
@@ -8,6 +8,7 @@ class Player(pygame.sprite.Sprite):
         self.base_path = base_path
         
         self.rect = pygame.Rect(x, y, 48, 60)
+        self.prev_pos = self.rect.topleft
         self.x = float(x)
         self.y = float(y)
         self.vel_x = 0
@@ -33,20 +34,23 @@ class Player(pygame.sprite.Sprite):
         self.animations = {}
         self.frame_counts = {}
     
-    def _combine_layers(self, layer_files, animation_folder):
-        first_layer = pygame.image.load(f"{self.base_path}/{animation_folder}/{layer_files[0]}")
+    @staticmethod
+    def combine_layers(base_path, layer_files, animation_folder):
+        first_layer = pygame.image.load(f"{base_path}/{animation_folder}/{layer_files[0]}")
         combined = pygame.Surface(first_layer.get_size(), pygame.SRCALPHA)
         
         for layer_file in layer_files:
             try:
-                layer = pygame.image.load(f"{self.base_path}/{animation_folder}/{layer_file}")
+                layer = pygame.image.load(f"{base_path}/{animation_folder}/{layer_file}")
                 combined.blit(layer, (0, 0))
             except:
                 pass
         
         return combined
     
-    def update(self, keys, platforms):
+    def update(self, keys, level):
+        self.prev_pos = self.rect.topleft
+        
         if self.is_hurt:
             self.hurt_timer -= 1
             if self.hurt_timer <= 0:
@@ -80,35 +84,15 @@ class Player(pygame.sprite.Sprite):
         self.x += self.vel_x
         self.rect.x = int(self.x)
         
-        for platform in platforms:
-            platform_rect = platform['rect'] if isinstance(platform, dict) else platform
-            
-            if self.rect.colliderect(platform_rect):
-                if self.vel_x > 0:
-                    self.rect.right = platform_rect.left
-                    self.x = self.rect.x
-                elif self.vel_x < 0:
-                    self.rect.left = platform_rect.right
-                    self.x = self.rect.x
+        level.resolve_horizontal(self)
         
         self.y += self.vel_y
         self.rect.y = int(self.y)
         
         self.on_ground = False
-        for platform in platforms:
-            platform_rect = platform['rect'] if isinstance(platform, dict) else platform
-            
-            if self.rect.colliderect(platform_rect):
-                if self.vel_y > 0:
-                    self.rect.bottom = platform_rect.top
-                    self.y = self.rect.y
-                    self.vel_y = 0
-                    self.on_ground = True
-                    self.jumps_left = self.max_jumps
-                elif self.vel_y < 0:
-                    self.rect.top = platform_rect.bottom
-                    self.y = self.rect.y
-                    self.vel_y = 0
+        if level.resolve_vertical(self):
+            self.on_ground = True
+            self.jumps_left = self.max_jumps
         
         self._update_animation()
     
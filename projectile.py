@@ -1,9 +1,58 @@
 import pygame
 
+class ProjectilePool:
+    """Recicla proyectiles muertos en vez de crear y descartar objetos en cada disparo."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []
+        self.created = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+        else:
+            obj = self.factory(*args, **kwargs)
+            self.created += 1
+        obj.pooled = False
+        return obj
+
+    def release(self, obj):
+        if not obj.pooled:
+            obj.pooled = True
+            self.free.append(obj)
+
+
+def recycle_dead(projectiles):
+    """Saca de la lista los proyectiles muertos (sin list.remove) y los devuelve a su pool."""
+    keep = 0
+    for proj in projectiles:
+        if proj.alive:
+            projectiles[keep] = proj
+            keep += 1
+        else:
+            proj.release()
+    del projectiles[keep:]
+
+
 class Projectile(pygame.sprite.Sprite):
+    pool = None
+
     def __init__(self, x, y, direction):
         super().__init__()
-        
+        self.pooled = False
+        self.rect = pygame.Rect(0, 0, 16, 16)
+        self.reset(x, y, direction)
+
+    @classmethod
+    def spawn(cls, x, y, direction):
+        return cls.pool.acquire(x, y, direction)
+
+    def release(self):
+        type(self).pool.release(self)
+
+    def reset(self, x, y, direction):
         self.x = float(x)
         self.y = float(y)
         
@@ -23,28 +72,27 @@ class Projectile(pygame.sprite.Sprite):
             self.vel_x = 0
             self.vel_y = self.speed
         
-        self.rect = pygame.Rect(int(x), int(y), 16, 16)
+        self.rect.update(int(x), int(y), 16, 16)
+        self.prev_pos = self.rect.topleft
         
         self.color = (255, 100, 0)
         self.lifetime = 120
         self.alive = True
     
-    def update(self, platforms):
+    def update(self, level):
         self.lifetime -= 1
         if self.lifetime <= 0:
             self.alive = False
             return
         
+        self.prev_pos = self.rect.topleft
         self.x += self.vel_x
         self.y += self.vel_y
         self.rect.x = int(self.x)
         self.rect.y = int(self.y)
         
-        for platform in platforms:
-            platform_rect = platform['rect'] if isinstance(platform, dict) else platform
-            
-            if self.rect.colliderect(platform_rect):
-                self.alive = False
+        if level.collides(self.rect):
+            self.alive = False
     
     def draw(self, surface):
         pygame.draw.circle(surface, self.color, self.rect.center, 8)
@@ -56,8 +104,8 @@ class Projectile(pygame.sprite.Sprite):
 
 
 class Fireball(Projectile):
-    def __init__(self, x, y, direction):
-        super().__init__(x, y, direction)
+    def reset(self, x, y, direction):
+        super().reset(x, y, direction)
         self.speed = 10
         self.color = (255, 69, 0)
         
@@ -68,4 +116,8 @@ class Fireball(Projectile):
         elif direction == 0:
             self.vel_y = -self.speed
         elif direction == 2:
-            self.vel_y = self.speed
\ No newline at end of file
+            self.vel_y = self.speed
+
+
+Projectile.pool = ProjectilePool(Projectile)
+Fireball.pool = ProjectilePool(Fireball)
@@ -1,174 +1,246 @@
 """
 Script para generar versiones recoloreadas del personaje Mage.
-Genera tres versiones: Negro, Azul, y Rojo.
+Genera cuatro versiones: Negro, Azul, Rojo y Fondo.
+
+Cada capa se procesa como un arreglo completo (NumPy) y los archivos se reparten
+en un pool de procesos. Cada carpeta destino guarda un manifest con el hash de
+las capas fuente, de modo que solo se regeneran las que cambiaron.
 """
 
 from PIL import Image
+import numpy as np
 import os
+import json
 import shutil
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 
-def recolor_to_black(image):
-    """Convierte la imagen a escala de grises (negro)"""
-    # Convertir a RGBA si no lo está
+MANIFEST_NAME = ".recolor_manifest.json"
+RECOLOR_VERSION = 2
+
+def _split_channels(image):
+    """Devuelve la imagen como arreglo RGBA y su luminosidad entera"""
     if image.mode != 'RGBA':
         image = image.convert('RGBA')
-    
-    # Crear copia
-    result = image.copy()
-    pixels = result.load()
-    
-    for y in range(result.size[1]):
-        for x in range(result.size[0]):
-            r, g, b, a = pixels[x, y]
-            if a > 0:  # Solo procesar píxeles no transparentes
-                # Escala de grises
-                gray = int(0.299 * r + 0.587 * g + 0.114 * b)
-                pixels[x, y] = (gray, gray, gray, a)
-    
-    return result
+
+    rgba = np.array(image, dtype=np.uint8)
+    r = rgba[..., 0].astype(np.float64)
+    g = rgba[..., 1].astype(np.float64)
+    b = rgba[..., 2].astype(np.float64)
+    luminosity = np.floor(0.299 * r + 0.587 * g + 0.114 * b)
+
+    return rgba, luminosity
+
+def _apply(rgba, channels):
+    """Escribe los canales nuevos solo en los píxeles no transparentes"""
+    visible = rgba[..., 3] > 0
+    result = rgba.copy()
+    for index, channel in enumerate(channels):
+        result[..., index] = np.where(visible, channel, rgba[..., index]).astype(np.uint8)
+    return Image.fromarray(result, 'RGBA')
+
+def recolor_to_black(image):
+    """Convierte la imagen a escala de grises (negro)"""
+    rgba, gray = _split_channels(image)
+    return _apply(rgba, (gray, gray, gray))
 
 def recolor_to_blue(image):
     """Convierte la imagen a tonos azules"""
-    if image.mode != 'RGBA':
-        image = image.convert('RGBA')
-    
-    result = image.copy()
-    pixels = result.load()
-    
-    for y in range(result.size[1]):
-        for x in range(result.size[0]):
-            r, g, b, a = pixels[x, y]
-            if a > 0:
-                # Mantener luminosidad pero en canal azul
-                luminosity = int(0.299 * r + 0.587 * g + 0.114 * b)
-                pixels[x, y] = (0, int(luminosity * 0.3), luminosity, a)
-    
-    return result
+    rgba, luminosity = _split_channels(image)
+    # Mantener luminosidad pero en canal azul
+    return _apply(rgba, (np.zeros_like(luminosity), np.floor(luminosity * 0.3), luminosity))
 
 def recolor_to_red(image):
     """Convierte la imagen a tonos rojos"""
-    if image.mode != 'RGBA':
-        image = image.convert('RGBA')
-    
-    result = image.copy()
-    pixels = result.load()
-    
-    for y in range(result.size[1]):
-        for x in range(result.size[0]):
-            r, g, b, a = pixels[x, y]
-            if a > 0:
-                # Mantener luminosidad pero en canal rojo
-                luminosity = int(0.299 * r + 0.587 * g + 0.114 * b)
-                pixels[x, y] = (luminosity, int(luminosity * 0.2), 0, a)
-    
-    return result
+    rgba, luminosity = _split_channels(image)
+    # Mantener luminosidad pero en canal rojo
+    return _apply(rgba, (luminosity, np.floor(luminosity * 0.2), np.zeros_like(luminosity)))
 
 def recolor_to_background(image):
     """Convierte la imagen a los colores exactos del fondo del juego"""
-    if image.mode != 'RGBA':
-        image = image.convert('RGBA')
-    
-    result = image.copy()
-    pixels = result.load()
-    
+    rgba, luminosity = _split_channels(image)
+    norm_lum = luminosity / 255.0
+
     # Colores del gradiente del fondo del juego
     # Top: RGB(10, 20, 25)
     # Bottom: RGB(40, 80, 65)
     top_color = (10, 20, 25)
     bottom_color = (40, 80, 65)
-    
-    for y in range(result.size[1]):
-        for x in range(result.size[0]):
-            r, g, b, a = pixels[x, y]
-            if a > 0:
-                # Calcular luminosidad
-                luminosity = int(0.299 * r + 0.587 * g + 0.114 * b)
-                norm_lum = luminosity / 255.0
-                
-                # Interpolar entre top y bottom basado en la posición Y
-                progress = y / result.size[1]
-                
-                # Color base interpolado
-                base_r = int(top_color[0] + (bottom_color[0] - top_color[0]) * progress)
-                base_g = int(top_color[1] + (bottom_color[1] - top_color[1]) * progress)
-                base_b = int(top_color[2] + (bottom_color[2] - top_color[2]) * progress)
-                
-                # Aplicar luminosidad
-                final_r = int(base_r + (255 - base_r) * norm_lum * 0.5)
-                final_g = int(base_g + (255 - base_g) * norm_lum * 0.5)
-                final_b = int(base_b + (255 - base_b) * norm_lum * 0.5)
-                
-                pixels[x, y] = (final_r, final_g, final_b, a)
-    
-    return result
+
+    # Interpolar entre top y bottom basado en la posición Y
+    height = rgba.shape[0]
+    progress = (np.arange(height, dtype=np.float64) / height)[:, np.newaxis]
+
+    channels = []
+    for top, bottom in zip(top_color, bottom_color):
+        base = np.floor(top + (bottom - top) * progress)
+        # Aplicar luminosidad
+        channels.append(np.floor(base + (255 - base) * norm_lum * 0.5))
+
+    return _apply(rgba, channels)
+
+RECOLOR_FUNCTIONS = {
+    "black": recolor_to_black,
+    "blue": recolor_to_blue,
+    "red": recolor_to_red,
+    "background": recolor_to_background,
+}
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _load_manifest(target_dir):
+    path = os.path.join(target_dir, MANIFEST_NAME)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
+
+def _save_manifest(target_dir, manifest):
+    with open(os.path.join(target_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def recolor_file(job):
+    """Trabajo del pool: recolorea un archivo fuente y lo guarda en destino"""
+    source_path, target_path, variant = job
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    with Image.open(source_path) as img:
+        recolored = RECOLOR_FUNCTIONS[variant](img)
+    recolored.save(target_path)
+    return target_path
+
+def plan_mage_folder(source_dir, target_dir, variant):
+    """
+    Compara la carpeta fuente con el manifest del destino.
+
+    Args:
+        source_dir: Directorio fuente (ej: "Mage")
+        target_dir: Directorio destino (ej: "Mage_Black")
+        variant: Clave de RECOLOR_FUNCTIONS a aplicar
+
+    Returns:
+        (trabajos pendientes, manifest nuevo, archivos a copiar, archivos obsoletos)
+    """
+    old_manifest = _load_manifest(target_dir)
+    new_manifest = {}
+    jobs = []
+    copies = []
+    expected = set()
+
+    for root, dirs, files in os.walk(source_dir):
+        for file in files:
+            source_path = os.path.join(root, file)
+            rel_path = os.path.relpath(source_path, source_dir)
+            target_path = os.path.join(target_dir, rel_path)
+            expected.add(rel_path)
+
+            key = f"{RECOLOR_VERSION}:{variant}:{_file_hash(source_path)}"
+            new_manifest[rel_path] = key
+            if old_manifest.get(rel_path) == key and os.path.exists(target_path):
+                continue
+
+            if file.endswith('.png'):
+                jobs.append((source_path, target_path, variant))
+            else:
+                copies.append((source_path, target_path))
+
+    stale = []
+    if os.path.exists(target_dir):
+        for root, dirs, files in os.walk(target_dir):
+            for file in files:
+                rel_path = os.path.relpath(os.path.join(root, file), target_dir)
+                if rel_path != MANIFEST_NAME and rel_path not in expected:
+                    stale.append(os.path.join(target_dir, rel_path))
+
+    return jobs, new_manifest, copies, stale
+
+def process_mage_folders(source_dir, targets, workers=None):
+    """
+    Recolorea todas las variantes, regenerando solo las capas que cambiaron.
+
+    Args:
+        source_dir: Directorio fuente (ej: "Mage")
+        targets: Lista de (directorio destino, variante)
+        workers: Procesos del pool (por defecto, uno por CPU)
+    """
+    plans = []
+    all_jobs = []
+    for target_dir, variant in targets:
+        jobs, manifest, copies, stale = plan_mage_folder(source_dir, target_dir, variant)
+        plans.append((target_dir, manifest, jobs, copies, stale))
+        all_jobs.extend(jobs)
+
+    for target_dir, manifest, jobs, copies, stale in plans:
+        os.makedirs(target_dir, exist_ok=True)
+        for path in stale:
+            os.remove(path)
+        for source_path, target_path in copies:
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            shutil.copy2(source_path, target_path)
+
+    if all_jobs:
+        if workers == 1 or len(all_jobs) == 1:
+            for job in all_jobs:
+                recolor_file(job)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(recolor_file, all_jobs, chunksize=4))
+
+    for target_dir, manifest, jobs, copies, stale in plans:
+        _save_manifest(target_dir, manifest)
+        if jobs or copies or stale:
+            print(f"✓ {target_dir}: {len(jobs)} imágenes procesadas, {len(stale)} obsoletas eliminadas")
+        else:
+            print(f"✓ {target_dir}: sin cambios")
 
 def process_mage_folder(source_dir, target_dir, recolor_func):
     """
     Procesa todas las imágenes del Mage y las recolorea.
-    
+
     Args:
         source_dir: Directorio fuente (ej: "Mage")
         target_dir: Directorio destino (ej: "Mage_Black")
         recolor_func: Función de recoloreo a aplicar
     """
-    # Crear directorio destino si no existe
-    if os.path.exists(target_dir):
-        print(f"⚠️  {target_dir} ya existe, será sobrescrito...")
-        shutil.rmtree(target_dir)
-    
-    # Copiar estructura de carpetas
-    shutil.copytree(source_dir, target_dir)
-    
-    print(f"✓ Procesando {target_dir}...")
-    
-    # Recorrer todas las carpetas (Walk, Spell, Hurt)
-    total_images = 0
-    for root, dirs, files in os.walk(target_dir):
-        for file in files:
-            if file.endswith('.png'):
-                file_path = os.path.join(root, file)
-                
-                # Cargar imagen
-                img = Image.open(file_path)
-                
-                # Aplicar recoloreo
-                recolored = recolor_func(img)
-                
-                # Guardar
-                recolored.save(file_path)
-                total_images += 1
-    
-    print(f"  ✓ {total_images} imágenes procesadas")
+    variant = next(name for name, func in RECOLOR_FUNCTIONS.items() if func is recolor_func)
+    process_mage_folders(source_dir, [(target_dir, variant)])
 
 def main():
     source_dir = "assets/images/player/Mage"
-    
+
     if not os.path.exists(source_dir):
         print(f"❌ Error: No se encontró la carpeta '{source_dir}'")
         return
-    
+
     print("🎨 Generando versiones recoloreadas del Mage...")
     print()
-    
-    # Generar versión negra
-    process_mage_folder(source_dir, "assets/images/player/Mage_Black", recolor_to_black)
-    
-    # Generar versión azul
-    process_mage_folder(source_dir, "assets/images/player/Mage_Blue", recolor_to_blue)
-    
-    # Generar versión roja
-    process_mage_folder(source_dir, "assets/images/player/Mage_Red", recolor_to_red)
-    
-    # Generar versión del color del fondo
-    process_mage_folder(source_dir, "assets/images/player/Mage_Background", recolor_to_background)
-    
+
+    process_mage_folders(source_dir, [
+        # Versión negra
+        ("assets/images/player/Mage_Black", "black"),
+        # Versión azul
+        ("assets/images/player/Mage_Blue", "blue"),
+        # Versión roja
+        ("assets/images/player/Mage_Red", "red"),
+        # Versión del color del fondo
+        ("assets/images/player/Mage_Background", "background"),
+    ])
+
     print()
     print("✅ ¡Completado!")
-    print("   Se crearon las carpetas en assets/images/player/:")
+    print("   Carpetas en assets/images/player/:")
     print("   - Mage_Black (negro)")
     print("   - Mage_Blue (azul)")
     print("   - Mage_Red (rojo)")
     print("   - Mage_Background (color del fondo del juego)")
+    print("   Si cambiaron capas, vuelve a ejecutar bake_sprites.py para actualizar los atlas.")
 
 if __name__ == "__main__":
     main()
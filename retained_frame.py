@@ -0,0 +1,55 @@
+import pygame
+
+
+class RetainedFrame:
+    """
+    Pantalla en modo retenido (menu, seleccion de nivel, pausa): el contenido
+    estatico se compone una vez en una capa y en cada frame solo se restauran y
+    redibujan las regiones de los elementos dinamicos, que se presentan con
+    pygame.display.update(rects) en vez de un flip completo.
+    """
+
+    def __init__(self):
+        self.layer = None
+        self.key = None
+        self.state = None
+        self.previous = []
+        self.full = True
+
+    def invalidate(self):
+        """Obliga a recomponer la capa (p. ej. el mundo detras de la pausa cambio)"""
+        self.key = None
+        self.full = True
+
+    def refresh(self):
+        """La pantalla dejo de mostrar este frame: el proximo se presenta completo"""
+        self.full = True
+
+    def prepare(self, key, build):
+        if self.layer is None or key != self.key:
+            self.layer = build()
+            self.key = key
+            self.full = True
+
+    def changed(self, state):
+        """True si el estado dinamico (hover...) cambio desde el ultimo frame presentado"""
+        if self.full or state != self.state:
+            self.state = state
+            return True
+        return False
+
+    def begin(self, screen):
+        if self.full:
+            screen.blit(self.layer, (0, 0))
+        else:
+            for rect in self.previous:
+                screen.blit(self.layer, rect, rect)
+
+    def present(self, rects):
+        """rects son las regiones dibujadas este frame; tambien se actualizan las del anterior"""
+        if self.full:
+            pygame.display.flip()
+            self.full = False
+        else:
+            pygame.display.update(self.previous + rects)
+        self.previous = rects
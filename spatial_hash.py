@@ -0,0 +1,39 @@
+HIT_CELL_SIZE = 128
+
+
+class SpatialHash:
+    """
+    Rejilla uniforme para pruebas de impacto, reconstruida una vez por tick.
+    Cada rect se guarda en la celda de su esquina superior izquierda y las consultas
+    amplian la busqueda segun el rect mas grande insertado.
+    """
+
+    def __init__(self, cell_size=HIT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.clear()
+
+    def clear(self):
+        self.cells = {}
+        self.count = 0
+        self.max_width = 0
+        self.max_height = 0
+
+    def insert(self, rect, item):
+        key = (rect.x // self.cell_size, rect.y // self.cell_size)
+        self.cells.setdefault(key, []).append((self.count, rect, item))
+        self.count += 1
+        self.max_width = max(self.max_width, rect.width)
+        self.max_height = max(self.max_height, rect.height)
+
+    def query(self, rect):
+        """Items cuyo rect choca con rect, en el orden en que se insertaron."""
+        size = self.cell_size
+        found = []
+        for cx in range((rect.left - self.max_width + 1) // size, (rect.right - 1) // size + 1):
+            for cy in range((rect.top - self.max_height + 1) // size, (rect.bottom - 1) // size + 1):
+                for entry in self.cells.get((cx, cy), ()):
+                    if rect.colliderect(entry[1]):
+                        found.append(entry)
+
+        found.sort(key=lambda entry: entry[0])
+        return [item for _, _, item in found]
@@ -0,0 +1,44 @@
+"""
+Linea de tiempo del arranque (GAME_PROFILE_STARTUP=1).
+
+Cada fase se cierra con mark() y report() imprime cuanto tardo cada una desde la
+anterior. Se mide desde que main importa este modulo (el arranque del interprete
+no cuenta: para el detalle de los imports esta python -X importtime).
+
+Este modulo no importa pygame ni config para poder medir sus imports.
+"""
+
+import os
+import time
+
+ENABLED = os.environ.get("GAME_PROFILE_STARTUP") == "1"
+
+_last = time.perf_counter()
+_marks = []
+
+
+def start():
+    """Empieza una linea de tiempo nueva (p. ej. la carga de un nivel)"""
+    global _last
+    _marks.clear()
+    _last = time.perf_counter()
+
+
+def mark(phase):
+    global _last
+    if ENABLED:
+        now = time.perf_counter()
+        _marks.append((phase, now - _last))
+        _last = now
+
+
+def report(title):
+    if not ENABLED or not _marks:
+        return
+    total = sum(duration for _, duration in _marks)
+    print(f"[arranque] {title}: {total * 1000:.1f} ms")
+    elapsed = 0.0
+    for phase, duration in _marks:
+        elapsed += duration
+        print(f"  {phase:<32} {duration * 1000:8.1f} ms  (t={elapsed * 1000:.1f} ms)")
+    _marks.clear()
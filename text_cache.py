@@ -0,0 +1,42 @@
+import pygame
+from collections import OrderedDict
+
+MAX_CACHED_TEXTS = 512
+
+_fonts = {}
+_rendered = OrderedDict()
+
+
+def get_font(size, name=None, bold=False):
+    """Devuelve una fuente compartida; name=None usa la fuente por defecto de pygame."""
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if name is None:
+            font = pygame.font.Font(None, size)
+            font.set_bold(bold)
+        else:
+            font = pygame.font.SysFont(name, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+def render_text(font, text, color, antialias=True):
+    """Renderiza texto una sola vez por (fuente, texto, color, antialias), con desalojo LRU."""
+    key = (font, text, tuple(color), antialias)
+    surface = _rendered.get(key)
+    if surface is not None:
+        _rendered.move_to_end(key)
+        return surface
+
+    surface = font.render(text, antialias, color)
+    _rendered[key] = surface
+    if len(_rendered) > MAX_CACHED_TEXTS:
+        _rendered.popitem(last=False)
+    return surface
+
+
+def clear_text_cache():
+    _rendered.clear()
@@ -1,5 +1,6 @@
 import pygame
 from boss import Boss
+from text_cache import get_font, render_text
 
 class UndeadExecutioner(Boss):
     def __init__(self, x, y):
@@ -194,7 +195,7 @@ class UndeadExecutioner(Boss):
         pygame.draw.rect(surface, (255, 255, 255), (screen_x, screen_y, bar_w, bar_h), 2)
         
         # Texto nombre
-        font = pygame.font.Font(None, 30)
-        text = font.render("UNDEAD EXECUTIONER", True, (255, 255, 255))
+        font = get_font(30)
+        text = render_text(font, "UNDEAD EXECUTIONER", (255, 255, 255))
         text_rect = text.get_rect(center=(screen_x + bar_w//2, screen_y - 15))
         surface.blit(text, text_rect)